@@ -0,0 +1,88 @@
+"""Asynchronous ASCT+B Reporter client fetching many sheets concurrently"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from asctb2ccf.client import AsctbReporterClient
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_PER_HOST = 4
+# Seconds, beyond the read timeout of a single request
+DEFAULT_REQUEST_TIMEOUT = 330
+
+
+class AsyncAsctbReporterClient:
+    """Fetches ASCT+B tables with asyncio, many of them at a time.
+
+    The requests are run by the blocking AsctbReporterClient in a thread
+    pool, so the caching and offline settings of that client apply. At most
+    `max_concurrency` requests are in flight at a time, and at most
+    `max_per_host` of them go to the same host.
+
+    Args:
+        client (AsctbReporterClient): The client making the requests
+            (default=a client without cache)
+        max_concurrency (int): The maximum number of requests in flight
+        max_per_host (int): The maximum number of requests in flight to
+            the same host
+        timeout (float): The number of seconds after which a request is
+            given up. The blocking request still runs until its own
+            timeout, but its slot is released.
+    """
+    def __init__(self,
+                 client=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 max_per_host=DEFAULT_MAX_PER_HOST,
+                 timeout=DEFAULT_REQUEST_TIMEOUT):
+        self.client = client if client is not None else AsctbReporterClient()
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._semaphore = None
+        self._host_semaphores = {}
+
+    async def get_data_by_gsheet_url(self, gsheet_url, format="json"):
+        """Returns the ASCT+B table in the given output format given the
+           Google Sheet URL. Raises asyncio.TimeoutError when the request
+           takes longer than the timeout.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        host = urlparse(self.client.base_url).netloc
+        host_semaphore = self._host_semaphores.setdefault(
+            host, asyncio.Semaphore(self.max_per_host))
+        async with self._semaphore, host_semaphore:
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._executor,
+                                     self.client.get_data_by_gsheet_url,
+                                     gsheet_url, format),
+                self.timeout)
+
+    async def iter_data_by_gsheet_urls(self, gsheet_urls, format="json"):
+        """Fetches all the given Google Sheet URLs concurrently. Yields a
+           (gsheet_url, response, error) tuple as soon as each one
+           completes, where error is the exception raised by the request,
+           or None.
+        """
+        async def fetch(gsheet_url):
+            try:
+                response = await self.get_data_by_gsheet_url(gsheet_url,
+                                                             format)
+            except Exception as e:
+                return gsheet_url, None, e
+            return gsheet_url, response, None
+
+        tasks = [asyncio.ensure_future(fetch(gsheet_url))
+                 for gsheet_url in dict.fromkeys(gsheet_urls)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
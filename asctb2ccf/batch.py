@@ -0,0 +1,224 @@
+"""Batch conversion of several ASCT+B tables in a process pool"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import asctb2ccf.pipeline
+from asctb2ccf import __version__
+from asctb2ccf.async_client import AsyncAsctbReporterClient,\
+    DEFAULT_MAX_CONCURRENCY, DEFAULT_MAX_PER_HOST, DEFAULT_REQUEST_TIMEOUT
+from asctb2ccf.client import AsctbReporterClient
+
+
+_MANIFEST_KEYS = ['organ_name', 'gsheet_url', 'input_csv', 'ontology_iri',
+                  'output', 'cell_biomarkers_only']
+
+# The settings of an organ that its output file depends on
+_OUTPUT_SETTINGS = _MANIFEST_KEYS + [
+    'cell_location', 'closure', 'index', 'format', 'compress', 'streaming',
+    'store', 'validate', 'validation_report']
+
+
+# The options of the batch mode, with the defaults of the command line,
+# in addition to the conversion options of asctb2ccf.pipeline
+DEFAULT_OPTIONS = {
+    'jobs': None,  # as many as CPUs
+    'fetch_concurrency': DEFAULT_MAX_CONCURRENCY,
+    'fetch_per_host': DEFAULT_MAX_PER_HOST,
+    'fetch_timeout': DEFAULT_REQUEST_TIMEOUT,
+    'checkpoint': None
+}
+
+
+def run(args):
+    """Converts every organ listed in the manifest file `args.manifest`.
+
+    The manifest is a JSON list of objects with the keys `organ_name`,
+    `gsheet_url` (or `input_csv`), `ontology_iri`, `output` and (optionally)
+    `cell_biomarkers_only`. The sheets are fetched concurrently, and every
+    organ is converted as soon as its sheet arrives, in parallel using
+    `args.jobs` worker processes. Every successful conversion is recorded
+    in the checkpoint file so that rerunning the same manifest after a
+    failure only converts the organs that failed or changed. The
+    checkpoint file is deleted once every organ has been converted. The
+    options missing from `args` take their default value.
+    """
+    args = asctb2ccf.pipeline.with_defaults(
+        args, {**asctb2ccf.pipeline.DEFAULT_OPTIONS, **DEFAULT_OPTIONS})
+    manifest = load_manifest(args.manifest)
+    checkpoint_path = args.checkpoint or f"{args.manifest}.checkpoint"
+    checkpoint = Checkpoint(checkpoint_path)
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {}
+        for entry in manifest:
+            if not _is_fetched(entry):
+                organ_args = _make_args(args, entry)
+                try:
+                    with open(entry['input_csv'], 'rb') as f:
+                        fingerprint = get_fingerprint(organ_args, f.read())
+                except OSError as e:
+                    logging.error(f"Failed to read {entry['organ_name']}: "
+                                  f"{e}")
+                    failed.append(entry['organ_name'])
+                    continue
+                _submit(executor, futures, checkpoint, organ_args,
+                        fingerprint)
+        failed.extend(asyncio.run(
+            _fetch_and_submit(args, executor, manifest, futures,
+                              checkpoint)))
+        for future in as_completed(futures):
+            organ_args, fingerprint = futures[future]
+            organ_name = organ_args.organ_name
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Failed to convert {organ_name}: {e}")
+                failed.append(organ_name)
+            else:
+                logging.info(f"Converted {organ_name} to {organ_args.output}")
+                checkpoint.mark_done(organ_args.output, fingerprint)
+
+    if failed:
+        raise RuntimeError("Some organs failed to convert: "
+                           + ", ".join(sorted(failed)))
+    checkpoint.clear()
+
+
+def load_manifest(path):
+    """Reads and checks the batch manifest file"""
+    with open(path) as f:
+        manifest = json.load(f)
+    if not isinstance(manifest, list):
+        raise ValueError("The manifest must be a list of organ entries")
+    for entry in manifest:
+        for key in ['organ_name', 'ontology_iri', 'output']:
+            if not entry.get(key):
+                raise ValueError(f"Missing '{key}' in manifest entry: "
+                                 + json.dumps(entry))
+        if not entry.get('gsheet_url') and not entry.get('input_csv'):
+            raise ValueError("Missing 'gsheet_url' or 'input_csv' in "
+                             "manifest entry: " + json.dumps(entry))
+        unknown_keys = set(entry) - set(_MANIFEST_KEYS)
+        if unknown_keys:
+            raise ValueError("Unknown manifest keys: "
+                             + ", ".join(sorted(unknown_keys)))
+    return manifest
+
+
+def get_fingerprint(organ_args, content):
+    """Returns the hash of the table content of an organ together with
+       every setting its output depends on and the converter version
+    """
+    settings = {key: getattr(organ_args, key, None)
+                for key in _OUTPUT_SETTINGS}
+    digest = hashlib.sha1()
+    digest.update(f"{__version__}\0".encode('utf-8'))
+    digest.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+    digest.update(b"\0")
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def _submit(executor, futures, checkpoint, organ_args, fingerprint,
+            rows=None):
+    if checkpoint.is_done(organ_args.output, fingerprint):
+        logging.info(f"Skipping {organ_args.organ_name}, already converted")
+        return
+    future = executor.submit(asctb2ccf.pipeline.run, organ_args, rows=rows)
+    futures[future] = (organ_args, fingerprint)
+
+
+async def _fetch_and_submit(args, executor, entries, futures, checkpoint):
+    """Fetches the sheets of the entries and submits the conversion of each
+       organ to the executor as soon as its sheet is fetched, unless the
+       checkpoint records it as converted. Returns the names of the organs
+       whose sheet could not be fetched.
+    """
+    entries_by_url = {}
+    for entry in entries:
+        if _is_fetched(entry):
+            entries_by_url.setdefault(entry['gsheet_url'], []).append(entry)
+    if not entries_by_url:
+        return []
+
+    client = AsyncAsctbReporterClient(
+        AsctbReporterClient(cache_dir=args.cache_dir,
+                            cache_ttl=args.cache_ttl,
+                            offline=args.offline),
+        max_concurrency=args.fetch_concurrency,
+        max_per_host=args.fetch_per_host,
+        timeout=args.fetch_timeout)
+    failed = []
+    try:
+        async for gsheet_url, response, error in\
+                client.iter_data_by_gsheet_urls(entries_by_url):
+            for entry in entries_by_url[gsheet_url]:
+                organ_name = entry['organ_name']
+                if error is not None:
+                    logging.error(f"Failed to fetch {organ_name}: "
+                                  f"{str(error) or type(error).__name__}")
+                    failed.append(organ_name)
+                    continue
+                organ_args = _make_args(args, entry)
+                content = json.dumps(response['data'], sort_keys=True)
+                _submit(executor, futures, checkpoint, organ_args,
+                        get_fingerprint(organ_args, content.encode('utf-8')),
+                        rows=response['data'])
+    finally:
+        client.close()
+    return failed
+
+
+def _is_fetched(entry):
+    # The local CSV file is used instead of the sheet when both are given
+    return entry.get('gsheet_url') and not entry.get('input_csv')
+
+
+def _make_args(args, entry):
+    # Start from the command-line arguments so that any other option
+    # (e.g. caching or output settings) applies to every organ.
+    organ_args = Namespace(**vars(args))
+    organ_args.manifest = None
+    organ_args.gsheet_url = None
+    organ_args.input_csv = None
+    organ_args.cell_biomarkers_only = entry.get('cell_biomarkers_only',
+                                                args.cell_biomarkers_only)
+    for key, value in entry.items():
+        setattr(organ_args, key, value)
+    return organ_args
+
+
+class Checkpoint:
+    """Records the organs that have been converted successfully, by output
+    file. An organ is considered done when the fingerprint of its table
+    and settings did not change since the last successful conversion and
+    its output file still exists.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.done = json.load(f)
+
+    def is_done(self, output, fingerprint):
+        return self.done.get(output) == fingerprint\
+            and os.path.exists(output)
+
+    def mark_done(self, output, fingerprint):
+        self.done[output] = fingerprint
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.done, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        self.done = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
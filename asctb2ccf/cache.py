@@ -0,0 +1,146 @@
+"""On-disk caches of the ASCT+B Reporter API responses and the builds"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from asctb2ccf import __version__
+
+
+DEFAULT_TTL = 24 * 60 * 60  # one day, in seconds
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024  # in bytes
+DEFAULT_BUILD_CACHE_SIZE = 4 * 1024 * 1024 * 1024  # in bytes
+
+
+class ResponseCache:
+    """Content-addressed store of JSON responses.
+
+    Every entry lives in a file named after the SHA-256 digest of its key
+    parts, e.g. the sheet id, the gid and the output format. Entries older
+    than `ttl` seconds are considered stale, and the least recently used
+    entries are evicted once the cache grows beyond `max_size` bytes.
+    """
+    def __init__(self, cache_dir, ttl=DEFAULT_TTL, max_size=DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size = max_size
+
+    def key(self, *parts):
+        content = "\0".join(str(part) for part in parts).encode('utf-8')
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, key, ignore_ttl=False):
+        """Returns the cached response for the given key, or None if there
+           is no entry or the entry is stale.
+        """
+        path = self._path(key)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            if not ignore_ttl and self.ttl is not None and age > self.ttl:
+                return None
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Record the access for the least-recently-used eviction, without
+        # changing the modification time used for the TTL.
+        os.utime(path, (time.time(), os.path.getmtime(path)))
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        evict_lru(self.cache_dir, self.max_size)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+
+class BuildCache:
+    """Content-addressed store of the built ontology files.
+
+    An entry is keyed on the hash of the table rows together with every
+    setting the output depends on and the converter version, so a key only
+    matches when rebuilding would give the same file. The cached file is
+    copied to the output, never linked, so that writing the output later
+    cannot change the cache entry. The least recently used entries are
+    evicted once the cache grows beyond `max_size` bytes.
+    """
+    def __init__(self, cache_dir, max_size=DEFAULT_BUILD_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def key(self, rows, organ_name, ontology_iri, mode, format,
+            compression=None):
+        """Returns the key of the build of the given rows and settings"""
+        digest = hashlib.sha256()
+        for part in [__version__, organ_name, ontology_iri, mode, format,
+                     compression]:
+            digest.update(f"{part}\0".encode('utf-8'))
+        for row in rows:
+            digest.update(json.dumps(row, sort_keys=True).encode('utf-8'))
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    def fetch(self, key, destination):
+        """Copies the cached file of the key to the destination, replacing
+           it with a new file. Returns False if there is no such file.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return False
+        # Record the access for the least-recently-used eviction
+        os.utime(path)
+        tmp_path = f"{destination}.tmp"
+        shutil.copyfile(path, tmp_path)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, destination)
+        return True
+
+    def put(self, key, source):
+        """Stores a copy of the source file under the key"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        os.close(fd)
+        shutil.copyfile(source, tmp_path)
+        shutil.copymode(source, tmp_path)
+        os.replace(tmp_path, path)
+        evict_lru(self.cache_dir, self.max_size)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+
+def evict_lru(directory, max_size):
+    """Removes the least recently accessed files under `directory` until
+       their total size is no larger than `max_size` bytes.
+    """
+    if max_size is None:
+        return
+    entries = []
+    total_size = 0
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+            total_size += stat.st_size
+    entries.sort()
+    for _, size, path in entries:
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_size -= size
@@ -1,5 +1,6 @@
 from urllib.parse import urlparse, parse_qs, quote_plus
-from asctb2ccf.utils import json_handler
+from asctb2ccf.cache import ResponseCache, DEFAULT_TTL, DEFAULT_MAX_SIZE
+from asctb2ccf.utils import json_handler, get_session
 
 
 class AsctbReporterClient:
@@ -10,6 +11,20 @@ class AsctbReporterClient:
     Attributes:
         get_ontology: Retrieves the ontology resource in JSON-LD format given
         the organ name.
+
+    Args:
+        cache_dir (str): The directory of the on-disk response cache. The
+            responses are not cached when omitted.
+        cache_ttl (int): The number of seconds a cached response stays
+            fresh (default=one day)
+        cache_max_size (int): The maximum size of the cache directory in
+            bytes (default=512 MB)
+        offline (bool): Use the cached responses only, regardless of their
+            age, and never access the network
+        session (requests.Session): The HTTP session to use (default=the
+            session shared by the process)
+        base_url (str): The URL of the ASCT+B Reporter API (default=the
+            public service), e.g. a local stand-in server for testing
     """
 
     _BASE_URL = "https://mmpyikxkcp.us-east-2.awsapprunner.com"
@@ -18,6 +33,22 @@ class AsctbReporterClient:
     _OUTPUT = "output"
     _CSV_URL = "csvUrl"
 
+    def __init__(self,
+                 cache_dir=None,
+                 cache_ttl=DEFAULT_TTL,
+                 cache_max_size=DEFAULT_MAX_SIZE,
+                 offline=False,
+                 session=None,
+                 base_url=None):
+        self.cache = None
+        if cache_dir:
+            self.cache = ResponseCache(cache_dir, cache_ttl, cache_max_size)
+        self.offline = offline
+        if offline and self.cache is None:
+            raise ValueError("Offline mode requires a cache directory")
+        self.session = session if session is not None else get_session()
+        self.base_url = base_url if base_url is not None else self._BASE_URL
+
     def get_data_by_gsheet_url(self,
                                gsheet_url,
                                format="json"):
@@ -35,16 +66,44 @@ class AsctbReporterClient:
         Returns:
             The ASCT+B table in the given output format
         """
-        export_csv_url = self._get_export_csv_url_by_gsheet_url(gsheet_url)
-        return self._get_data(export_csv_url, format)
+        if self.cache is None:
+            export_csv_url = self._get_export_csv_url_by_gsheet_url(gsheet_url)
+            return self._get_data(export_csv_url, format)
+
+        sheet_id, gid = self._get_sheet_id_and_gid(gsheet_url)
+        key = self.cache.key(sheet_id, gid, format)
+        response = self.cache.get(key, ignore_ttl=self.offline)
+        if response is None:
+            if self.offline:
+                raise LookupError(
+                    f"No cached snapshot of {gsheet_url} in offline mode")
+            export_csv_url = self._get_export_csv_url_by_gsheet_url(gsheet_url)
+            # Only the parsed responses of successful requests get here,
+            # the error statuses and invalid JSON bodies raise
+            response = self._get_data(export_csv_url, format)
+            self.cache.put(key, response)
+        return response
 
     def _get_data(self, export_csv_url, format):
-        base_endpoint = f"{self._BASE_URL}/{self._VERSION}/{self._CSV}"
+        base_endpoint = f"{self.base_url}/{self._VERSION}/{self._CSV}"
         options = f"{self._OUTPUT}={format}&{self._CSV_URL}={export_csv_url}"
         url = f"{base_endpoint}?{options}"
-        response = json_handler(url)
+        response = json_handler(url, self.session)
         return response
 
     def _get_export_csv_url_by_gsheet_url(self, gsheet_url):
         export_url = gsheet_url.replace('edit#', 'export?')
         return quote_plus(f'{export_url}&format=csv')
+
+    def _get_sheet_id_and_gid(self, gsheet_url):
+        url = urlparse(gsheet_url)
+        # The path looks like /spreadsheets/d/<sheet id>/edit
+        path_parts = url.path.split('/')
+        try:
+            sheet_id = path_parts[path_parts.index('d') + 1]
+        except (ValueError, IndexError):
+            raise ValueError("Invalid Google Sheet URL: " + gsheet_url)
+        params = parse_qs(url.fragment)
+        params.update(parse_qs(url.query))
+        gid = params.get('gid', ['0'])[0]
+        return sheet_id, gid
@@ -0,0 +1,152 @@
+"""Transitive closure of the ccf_part_of and ccf_ct_isa hierarchies"""
+from asctb2ccf.namespace import CCF
+
+
+class ClosureIndex:
+    """Ancestors and descendants of the nodes of a parent relation.
+
+    The parent -> child edges are added while the rows are converted, and
+    the transitive closure is computed once, on the first query after the
+    last edge is added. Every node is given a bit position, and its
+    ancestors and descendants are kept as bitsets (Python integers), so
+    that checking whether a node is an ancestor of another one is a single
+    bit test. The relation is expected to be acyclic, the edges closing a
+    cycle are ignored by the closure.
+    """
+    def __init__(self):
+        self._parents = {}
+        self._children = {}
+        self._positions = {}
+        self._nodes = []
+        self._ancestors = None
+        self._descendants = None
+
+    @classmethod
+    def from_graph(cls, graph, predicate):
+        """Returns the index of the (child, predicate, parent) triples of
+           the graph
+        """
+        index = cls()
+        for child, _, parent in graph.triples((None, predicate, None)):
+            index.add(child, parent)
+        return index
+
+    def add(self, child, parent):
+        """Records that the parent is a direct parent of the child"""
+        parents = self._parents.setdefault(child, set())
+        if parent in parents:
+            return
+        parents.add(parent)
+        self._children.setdefault(parent, set()).add(child)
+        for node in (child, parent):
+            if node not in self._positions:
+                self._positions[node] = len(self._nodes)
+                self._nodes.append(node)
+        self._ancestors = self._descendants = None
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        return node in self._positions
+
+    def parents(self, node):
+        """Returns the set of the direct parents of the node"""
+        return set(self._parents.get(node, ()))
+
+    def children(self, node):
+        """Returns the set of the direct children of the node"""
+        return set(self._children.get(node, ()))
+
+    def ancestors(self, node):
+        """Returns the set of the transitive parents of the node"""
+        if node not in self._positions:
+            return set()
+        self._build()
+        return self._decode(self._ancestors[self._positions[node]])
+
+    def descendants(self, node):
+        """Returns the set of the transitive children of the node"""
+        if node not in self._positions:
+            return set()
+        self._build()
+        return self._decode(self._descendants[self._positions[node]])
+
+    def is_ancestor(self, ancestor, node):
+        """Returns True if the ancestor is a transitive parent of the node"""
+        if ancestor not in self._positions or node not in self._positions:
+            return False
+        self._build()
+        return bool(self._ancestors[self._positions[node]]
+                    >> self._positions[ancestor] & 1)
+
+    def edges(self, indirect_only=False):
+        """Yields the (node, ancestor) pairs of the transitive closure, or
+           only the ones that are not direct parent edges
+        """
+        self._build()
+        for position, node in enumerate(self._nodes):
+            ancestors = self._decode(self._ancestors[position])
+            if indirect_only:
+                ancestors -= self._parents.get(node, set())
+            for ancestor in ancestors:
+                yield node, ancestor
+
+    def _build(self):
+        if self._ancestors is None:
+            self._ancestors = self._close(self._parents)
+            self._descendants = self._close(self._children)
+
+    def _close(self, adjacency):
+        """Returns the bitset of the nodes reachable from every node through
+           the adjacency, computed in a depth-first post-order
+        """
+        positions = self._positions
+        closure = [None] * len(self._nodes)
+        for root in range(len(self._nodes)):
+            if closure[root] is not None:
+                continue
+            closure[root] = 0
+            stack = [(root, iter(adjacency.get(self._nodes[root], ())))]
+            while stack:
+                position, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    neighbor_position = positions[neighbor]
+                    if closure[neighbor_position] is None:
+                        # The bitset is completed once the neighbors of
+                        # the neighbor are done
+                        closure[neighbor_position] = 0
+                        stack.append((neighbor_position, iter(
+                            adjacency.get(neighbor, ()))))
+                        break
+                else:
+                    stack.pop()
+                    bits = 0
+                    for neighbor in adjacency.get(self._nodes[position], ()):
+                        neighbor_position = positions[neighbor]
+                        bits |= (1 << neighbor_position) \
+                            | closure[neighbor_position]
+                    # A node in a cycle is not its own ancestor
+                    closure[position] = bits & ~(1 << position)
+        return closure
+
+    def _decode(self, bits):
+        nodes = set()
+        while bits:
+            low_bit = bits & -bits
+            nodes.add(self._nodes[low_bit.bit_length() - 1])
+            bits ^= low_bit
+        return nodes
+
+
+def materialize_closure(graph, predicates=(CCF.ccf_part_of, CCF.ccf_ct_isa)):
+    """Adds the transitive edges of the given hierarchies to the graph.
+       Returns the number of edges added.
+    """
+    count = 0
+    for predicate in predicates:
+        index = ClosureIndex.from_graph(graph, predicate)
+        for node, ancestor in index.edges(indirect_only=True):
+            graph.add((node, predicate, ancestor))
+            count += 1
+    return count
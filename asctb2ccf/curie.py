@@ -0,0 +1,101 @@
+"""Resolver of the compact URIs (CURIEs) used in the ASCT+B tables"""
+import re
+from functools import lru_cache
+
+
+# Prefix -> IRI namespace. Adding a new ontology only requires a new
+# entry here and in the categories that accept it.
+PREFIXES = {
+    'ASCTB-TEMP': "https://purl.org/ccf/ASCTB-TEMP_",
+    'UBERON': "http://purl.obolibrary.org/obo/UBERON_",
+    'FMA': "http://purl.org/sig/ont/fma/fma",
+    'CL': "http://purl.obolibrary.org/obo/CL_",
+    'PCL': "http://purl.obolibrary.org/obo/PCL_",
+    'LMHA': "http://purl.obolibrary.org/obo/LMHA_",
+    'HGNC': "http://identifiers.org/hgnc/"
+}
+
+# Category -> (category name, allowed prefixes)
+CATEGORIES = {
+    'AS': ("anatomical structure", ['ASCTB-TEMP', 'FMA', 'UBERON']),
+    'CT': ("cell type", ['ASCTB-TEMP', 'PCL', 'CL', 'LMHA', 'FMA']),
+    'BM': ("biomarker", ['ASCTB-TEMP', 'HGNC'])
+}
+
+DEFAULT_CACHE_SIZE = 65536
+
+_DOI_PATTERN = re.compile("doi:\\s*", re.IGNORECASE)
+# The references converted to DOIs, with the exact doi: or DOI: prefix
+_DOI_REFERENCE_PATTERN = re.compile("doi:|DOI:")
+# The expanded DOIs with a registrant code and a suffix
+_DOI_IRI_PATTERN = re.compile(r"http://doi\.org/10\.\d+/\S")
+
+
+class CurieResolver:
+    """Expands the CURIEs of the anatomical structures, cell types and
+    biomarkers to full IRIs.
+
+    The prefix is looked up in the registry in constant time and checked
+    against the prefixes allowed for the category of the term. The
+    resolved IRIs are kept in a bounded least-recently-used cache.
+
+    Args:
+        prefixes (dict): The prefix to IRI namespace registry
+        categories (dict): The category code (e.g. 'AS') to a tuple of the
+            category name and the list of allowed prefixes
+        cache_size (int): The maximum number of cached IRIs
+    """
+    def __init__(self, prefixes=PREFIXES, categories=CATEGORIES,
+                 cache_size=DEFAULT_CACHE_SIZE):
+        self.prefixes = {prefix.upper(): namespace
+                         for prefix, namespace in prefixes.items()}
+        self.categories = {
+            category: (name, frozenset(prefix.upper() for prefix in allowed))
+            for category, (name, allowed) in categories.items()}
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _resolve(self, curie, category=None):
+        """Returns the IRI of the CURIE, e.g. UBERON:0002113. Raises a
+           ValueError if the prefix is unknown or not allowed in the given
+           category (AS, CT or BM).
+        """
+        prefix, separator, local_id = curie.strip().partition(':')
+        prefix = prefix.upper()
+        if category is None:
+            is_allowed = prefix in self.prefixes
+        else:
+            name, allowed_prefixes = self.categories[category]
+            is_allowed = prefix in allowed_prefixes
+        if not separator or not is_allowed:
+            if category is None:
+                raise ValueError("Invalid ID: " + curie)
+            raise ValueError(f"Invalid {name} ID: " + curie)
+        return self.prefixes[prefix] + local_id.strip()
+
+    def resolve_all(self, curies, category=None):
+        """Returns the IRIs of all the given CURIEs, e.g. a table column"""
+        resolve = self.resolve
+        return [resolve(curie, category) for curie in curies]
+
+    def get_prefix(self, curie):
+        """Returns the normalized prefix of the CURIE"""
+        return curie.strip().partition(':')[0].upper()
+
+
+def is_doi_reference(doi):
+    """Returns whether the reference is converted to a DOI, i.e. contains
+       doi: or DOI:
+    """
+    return _DOI_REFERENCE_PATTERN.search(doi) is not None
+
+
+def expand_doi(doi):
+    """Returns the http://doi.org IRI of a DOI reference, e.g. DOI: 10.1/x"""
+    return _DOI_PATTERN.sub("http://doi.org/", doi)
+
+
+def is_well_formed_doi(doi):
+    """Returns whether the expanded DOI reference starts with a DOI, e.g.
+       DOI: 10.1/x
+    """
+    return _DOI_IRI_PATTERN.match(expand_doi(doi).strip()) is not None
@@ -0,0 +1,123 @@
+"""Emitters of the OWL class declarations and class expressions"""
+from contextlib import contextmanager
+
+from rdflib import BNode
+from rdflib.namespace import OWL, RDF
+from rdflib.extras.infixowl import Class, Restriction, BooleanClass
+
+# Resolved once, rdflib builds a new URIRef on every namespace access
+_RDF_TYPE = RDF.type
+_RDF_FIRST = RDF.first
+_RDF_REST = RDF.rest
+_RDF_NIL = RDF.nil
+_OWL_CLASS = OWL.Class
+_OWL_RESTRICTION = OWL.Restriction
+_OWL_ON_PROPERTY = OWL.onProperty
+_OWL_SOME_VALUES_FROM = OWL.someValuesFrom
+_OWL_INTERSECTION_OF = OWL.intersectionOf
+
+
+class TripleEmitter:
+    """Writes the OWL triples of class declarations and class expressions
+    directly into the graph.
+
+    It produces the same triples as the infixowl classes but skips their
+    graph lookups and wrapper objects. The classes declared so far are
+    remembered so that every class is only declared once.
+    """
+    def __init__(self, graph):
+        self.graph = graph
+        self.declared = set()
+        self._add = graph.add
+
+    def add(self, triple):
+        """Adds the triple to the graph"""
+        self._add(triple)
+
+    @contextmanager
+    def batch(self):
+        """Collects the triples emitted within the block and adds them to
+           the graph in a single `addN` call when the block exits, even if
+           it exits with an error.
+        """
+        triples = []
+        self._add = triples.append
+        try:
+            yield
+        finally:
+            self._add = self.graph.add
+            self.graph.addN((s, p, o, self.graph) for s, p, o in triples)
+
+    def declare_class(self, iri):
+        """Adds the `iri rdf:type owl:Class` declaration.
+           Returns the class IRI.
+        """
+        if iri not in self.declared:
+            self.declared.add(iri)
+            self._add((iri, _RDF_TYPE, _OWL_CLASS))
+        return iri
+
+    def some_values_from(self, property, filler, identifier=None):
+        """Adds the `property some filler` restriction.
+           Returns the restriction node.
+        """
+        restriction = identifier if identifier is not None else BNode()
+        self._add((restriction, _RDF_TYPE, _OWL_RESTRICTION))
+        self._add((restriction, _OWL_ON_PROPERTY, property))
+        self._add((restriction, _OWL_SOME_VALUES_FROM, filler))
+        return restriction
+
+    def intersection_of(self, members, identifier=None):
+        """Adds the intersection of the given class expressions.
+           Returns the class expression node. The nodes of the RDF list
+           are named after the identifier when one is given.
+        """
+        intersection = identifier if identifier is not None else BNode()
+        self._add((intersection, _RDF_TYPE, _OWL_CLASS))
+        self._add((intersection, _OWL_INTERSECTION_OF,
+                   self._add_list(members, identifier)))
+        return intersection
+
+    def _add_list(self, items, identifier=None):
+        head = _RDF_NIL
+        for index, item in reversed(list(enumerate(items))):
+            if identifier is None:
+                node = BNode()
+            else:
+                node = BNode(f"{identifier}_{index}")
+            self._add((node, _RDF_FIRST, item))
+            self._add((node, _RDF_REST, head))
+            head = node
+        return head
+
+
+class InfixOwlEmitter:
+    """Builds the OWL class declarations and class expressions using the
+    rdflib infixowl classes. Kept as the reference for TripleEmitter.
+    """
+    def __init__(self, graph):
+        self.graph = graph
+
+    def add(self, triple):
+        self.graph.add(triple)
+
+    @contextmanager
+    def batch(self):
+        # The infixowl classes read the graph while building the class
+        # expressions, so the triples are added immediately.
+        yield
+
+    def declare_class(self, iri):
+        return Class(iri, graph=self.graph).identifier
+
+    def some_values_from(self, property, filler, identifier=None):
+        return Restriction(property,
+                           someValuesFrom=filler,
+                           graph=self.graph,
+                           identifier=identifier).identifier
+
+    def intersection_of(self, members, identifier=None):
+        return BooleanClass(identifier=identifier,
+                            operator=OWL.intersectionOf,
+                            members=members,
+                            graph=self.graph).identifier
@@ -0,0 +1,110 @@
+"""Output formats and compression of the ontology files"""
+import gzip
+import io
+
+from rdflib import plugin
+from rdflib.plugin import PluginException
+from rdflib.serializer import Serializer
+from rdflib.plugins.serializers.nt import _nt_row
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Format name -> rdflib serializer name
+FORMATS = {
+    'xml': 'application/rdf+xml',
+    'nt': 'nt',
+    'nt-sorted': 'nt',
+    'turtle': 'turtle',
+    'json-ld': 'json-ld'
+}
+
+_BUFFER_SIZE = 1 << 20
+
+# Compression -> file name extension
+COMPRESSIONS = {
+    'gzip': '.gz',
+    'zstd': '.zst'
+}
+
+
+def get_compression(destination, compression=None):
+    """Returns the given compression, or the one implied by the extension
+       of the destination file name, e.g. gzip for asctb-kidney.nt.gz
+    """
+    if compression is not None:
+        if compression not in COMPRESSIONS:
+            raise ValueError("Unknown compression: " + compression)
+        return compression
+    for name, extension in COMPRESSIONS.items():
+        if str(destination).endswith(extension):
+            return name
+    return None
+
+
+def open_output(destination, compression=None):
+    """Opens the destination file for writing bytes, compressing them on the
+       fly with the given compression (or the one implied by the extension)
+    """
+    compression = get_compression(destination, compression)
+    if compression == 'gzip':
+        # The serializers write many small chunks, which are buffered
+        # before being compressed
+        return io.BufferedWriter(gzip.open(destination, 'wb'),
+                                 _BUFFER_SIZE)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("The zstd compression requires the zstandard "
+                              "package: pip install zstandard")
+        return zstandard.ZstdCompressor().stream_writer(
+            open(destination, 'wb'), closefd=True)
+    return open(destination, 'wb')
+
+
+def open_input(source, compression=None):
+    """Opens the source file for reading bytes, decompressing them on the
+       fly with the given compression (or the one implied by the extension)
+    """
+    compression = get_compression(source, compression)
+    if compression == 'gzip':
+        return gzip.open(source, 'rb')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("The zstd compression requires the zstandard "
+                              "package: pip install zstandard")
+        # The lines are read from a buffer over the decompressed stream
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(
+            open(source, 'rb'), closefd=True), _BUFFER_SIZE)
+    return open(source, 'rb')
+
+
+def serialize(graph, destination, format='xml', compression=None):
+    """Writes the graph to the destination file in the given format (xml,
+       nt, nt-sorted, turtle or json-ld). The serializer writes straight to
+       the compressed stream, without an uncompressed copy.
+
+       The nt-sorted format is N-Triples with the lines sorted, so the same
+       graph always gives the same bytes. The blank nodes of the ontology
+       are named after their content, which keeps their labels stable too.
+    """
+    if format not in FORMATS:
+        raise ValueError("Unknown output format: " + format)
+    try:
+        plugin.get(FORMATS[format], Serializer)
+    except PluginException:
+        raise ImportError("The JSON-LD format requires the rdflib-jsonld "
+                          "package: pip install rdflib-jsonld")
+    with open_output(destination, compression) as stream:
+        if format == 'nt-sorted':
+            write_lines(stream, sorted(_nt_row(triple) for triple in graph))
+        else:
+            graph.serialize(destination=stream, format=FORMATS[format])
+
+
+def write_lines(stream, lines):
+    """Writes N-Triples lines to the binary stream"""
+    for line in lines:
+        stream.write(line.encode('ascii', '_rdflib_nt_escape'))
@@ -0,0 +1,163 @@
+"""Incremental rebuilds from the row snapshot of the previous run"""
+import hashlib
+import json
+import sqlite3
+from collections import Counter
+
+from rdflib.plugins.serializers.nt import _nt_row
+
+
+def fingerprint(row):
+    """Returns the fingerprint of an ASCT+B table row, which only changes
+       when the row content changes
+    """
+    content = json.dumps(row, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def get_lines(graph):
+    """Returns the set of N-Triples lines of the graph triples"""
+    return {_nt_row(triple) for triple in graph}
+
+
+class RowSnapshot:
+    """Remembers the rows converted by the previous run and the triples each
+    of them contributed, so that a rerun only converts the rows that changed.
+
+    The triples are kept as N-Triples lines, which preserves the labels of
+    the blank nodes. A triple contributed by several rows (e.g. a term or
+    a partonomy edge) is reference counted and only retracted when no row
+    needs it anymore. Identical rows are converted once and counted.
+
+    Args:
+        path (str): The SQLite file of the snapshot
+        settings (dict): The conversion settings the triples depend on. The
+            snapshot is discarded when they differ from the previous run.
+    """
+    def __init__(self, path, settings):
+        self.connection = sqlite3.connect(path)
+        self._create_tables()
+        settings = {key: json.dumps(value)
+                    for key, value in settings.items()}
+        previous = dict(self.connection.execute(
+            "SELECT key, value FROM setting"))
+        if previous != settings:
+            self.clear()
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO setting (key, value) VALUES (?, ?)",
+                    settings.items())
+
+    def fingerprints(self):
+        """Returns the fingerprints of the snapshot rows as a Counter of
+           fingerprint -> number of occurrences
+        """
+        return Counter(dict(self.connection.execute(
+            "SELECT fingerprint, occurrences FROM row")))
+
+    def add_row(self, fingerprint, lines=None, occurrences=1):
+        """Adds the occurrences of the row, and the triple lines it
+           contributes if the row is not in the snapshot yet
+        """
+        is_new = self.connection.execute(
+            "SELECT 1 FROM row WHERE fingerprint = ?",
+            (fingerprint,)).fetchone() is None
+        self.connection.execute(
+            "INSERT INTO row (fingerprint, occurrences) VALUES (?, ?) "
+            "ON CONFLICT (fingerprint) DO UPDATE "
+            "SET occurrences = occurrences + excluded.occurrences",
+            (fingerprint, occurrences))
+        if is_new:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO triple (line, refcount) VALUES (?, 0)",
+                ((line,) for line in lines))
+            self.connection.executemany(
+                "INSERT INTO provenance (fingerprint, triple_id) "
+                "SELECT ?, id FROM triple WHERE line = ?",
+                ((fingerprint, line) for line in lines))
+            self.connection.execute(
+                "UPDATE triple SET refcount = refcount + 1 WHERE id IN "
+                "(SELECT triple_id FROM provenance WHERE fingerprint = ?)",
+                (fingerprint,))
+
+    def remove_row(self, fingerprint, occurrences=1):
+        """Removes the occurrences of the row, and retracts the triples no
+           other row contributes once the last occurrence is removed
+        """
+        self.connection.execute(
+            "UPDATE row SET occurrences = occurrences - ? "
+            "WHERE fingerprint = ?", (occurrences, fingerprint))
+        if self.connection.execute(
+                "SELECT 1 FROM row WHERE fingerprint = ? "
+                "AND occurrences <= 0", (fingerprint,)).fetchone():
+            self.connection.execute(
+                "UPDATE triple SET refcount = refcount - 1 WHERE id IN "
+                "(SELECT triple_id FROM provenance WHERE fingerprint = ?)",
+                (fingerprint,))
+            self.connection.execute(
+                "DELETE FROM provenance WHERE fingerprint = ?",
+                (fingerprint,))
+            self.connection.execute(
+                "DELETE FROM row WHERE fingerprint = ?", (fingerprint,))
+            self.connection.execute("DELETE FROM triple WHERE refcount <= 0")
+
+    def update(self, rows, convert_row):
+        """Brings the snapshot in line with the given rows. Only the rows
+           missing from the snapshot are converted, by calling
+           `convert_row(index, row)`, which returns the triple lines of the
+           row. Returns the number of rows added and removed.
+        """
+        fingerprints = Counter()
+        new_rows = {}
+        for index, row in enumerate(rows):
+            key = fingerprint(row)
+            fingerprints[key] += 1
+            new_rows.setdefault(key, (index, row))
+
+        previous = self.fingerprints()
+        removed = previous - fingerprints
+        added = fingerprints - previous
+        with self.connection:
+            for key, occurrences in removed.items():
+                self.remove_row(key, occurrences)
+            for key, occurrences in added.items():
+                lines = None
+                if key not in previous:
+                    lines = convert_row(*new_rows[key])
+                self.add_row(key, lines, occurrences)
+        return sum(added.values()), sum(removed.values())
+
+    def lines(self):
+        """Yields the N-Triples lines of all the triples"""
+        for (line,) in self.connection.execute(
+                "SELECT line FROM triple ORDER BY id"):
+            yield line
+
+    def clear(self):
+        with self.connection:
+            for table in ['setting', 'row', 'provenance', 'triple']:
+                self.connection.execute(f"DELETE FROM {table}")
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM triple").fetchone()[0]
+
+    def _create_tables(self):
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS setting ("
+                "key TEXT PRIMARY KEY, value TEXT)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS row ("
+                "fingerprint TEXT PRIMARY KEY, occurrences INTEGER)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS triple ("
+                "id INTEGER PRIMARY KEY, line TEXT UNIQUE, "
+                "refcount INTEGER)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS provenance ("
+                "fingerprint TEXT, triple_id INTEGER, "
+                "PRIMARY KEY (fingerprint, triple_id)) WITHOUT ROWID")
@@ -0,0 +1,154 @@
+"""Index of the terms of an ontology, for lookups without the OWL file"""
+import json
+from collections import namedtuple
+
+from asctb2ccf import __version__
+from asctb2ccf.namespace import CCF, OBOINOWL
+
+
+# The annotations of a term. The biomarker types are a sorted tuple, e.g.
+# ('gene', 'protein') for a marker that is both, and empty for the
+# anatomical structures and the cell types.
+TermRecord = namedtuple('TermRecord', ['id', 'pref_label', 'asctb_type',
+                                       'is_provisional', 'biomarker_types'])
+
+
+class TermIndex:
+    """Terms added to an ontology, by IRI, and their relationships.
+
+    The index is filled while the rows are converted and answers the
+    lookups by IRI, by (case-insensitive) label, of the cell types a
+    biomarker characterizes and of the anatomical structures a cell type
+    is located in with dictionary lookups. It is saved to and loaded from
+    a JSON file, typically <output>.index.json. The IRIs are plain strings.
+    """
+    def __init__(self):
+        self.terms = {}
+        self._labels = {}
+        self._cell_types = {}
+        self._anatomical_structures = {}
+
+    def add_term(self, iri, term_id, pref_label, asctb_type,
+                 is_provisional=False, biomarker_type=None):
+        """Records a term. The first record of an IRI is kept, the other
+           labels of the term are only indexed for the label lookups, and
+           its other biomarker types are added to the record.
+        """
+        iri = str(iri)
+        biomarker_types = (str(biomarker_type),) if biomarker_type else ()
+        record = self.terms.get(iri)
+        if record is None:
+            self.terms[iri] = TermRecord(str(term_id), str(pref_label),
+                                         asctb_type, is_provisional,
+                                         biomarker_types)
+        else:
+            self._add_biomarker_types(iri, biomarker_types)
+        self._labels.setdefault(str(pref_label).lower(), set()).add(iri)
+
+    def add_annotated_terms(self, triples):
+        """Records the terms with an ASCT+B type among the given triples,
+           e.g. the seed triples of an ontology
+        """
+        annotations = {}
+        biomarker_types = {}
+        for s, p, o in triples:
+            annotations.setdefault(s, {})[p] = o
+            if p == CCF.ccf_biomarker_type:
+                biomarker_types.setdefault(s, []).append(o)
+        for iri, values in annotations.items():
+            if CCF.ccf_asctb_type in values:
+                self.add_term(
+                    iri, values.get(OBOINOWL.id, ""),
+                    values.get(CCF.ccf_pref_label, ""),
+                    str(values[CCF.ccf_asctb_type]),
+                    CCF.ccf_is_provisional in values)
+                for biomarker_type in biomarker_types.get(iri, []):
+                    self._add_biomarker_types(iri, (str(biomarker_type),))
+
+    def add_characterizations(self, ct_iris, bm_iris):
+        """Records that the biomarkers characterize the cell types"""
+        for bm_iri in bm_iris:
+            self._cell_types.setdefault(str(bm_iri), set()).update(
+                str(ct_iri) for ct_iri in ct_iris)
+
+    def add_locations(self, ct_iris, as_iris):
+        """Records that the cell types are located in the structures"""
+        for ct_iri in ct_iris:
+            self._anatomical_structures.setdefault(str(ct_iri), set()).update(
+                str(as_iri) for as_iri in as_iris)
+
+    def update(self, other):
+        """Adds the records of another index, e.g. of a shard"""
+        for iri, record in other.terms.items():
+            if iri in self.terms:
+                self._add_biomarker_types(iri, record.biomarker_types)
+            else:
+                self.terms[iri] = record
+        for mapping, other_mapping in [
+                (self._labels, other._labels),
+                (self._cell_types, other._cell_types),
+                (self._anatomical_structures,
+                 other._anatomical_structures)]:
+            for key, values in other_mapping.items():
+                mapping.setdefault(key, set()).update(values)
+
+    def _add_biomarker_types(self, iri, biomarker_types):
+        record = self.terms[iri]
+        if not set(biomarker_types) <= set(record.biomarker_types):
+            self.terms[iri] = record._replace(biomarker_types=tuple(
+                sorted(set(record.biomarker_types) | set(biomarker_types))))
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, iri):
+        return str(iri) in self.terms
+
+    def get(self, iri):
+        """Returns the TermRecord of the IRI, or None if it is unknown"""
+        return self.terms.get(str(iri))
+
+    def find_by_label(self, label):
+        """Returns the set of the IRIs of the terms with the given label"""
+        return self._labels.get(label.lower(), set())
+
+    def get_cell_types(self, bm_iri):
+        """Returns the set of the cell types the biomarker characterizes"""
+        return self._cell_types.get(str(bm_iri), set())
+
+    def get_anatomical_structures(self, ct_iri):
+        """Returns the set of the structures the cell type is located in"""
+        return self._anatomical_structures.get(str(ct_iri), set())
+
+    def save(self, destination):
+        with open(destination, 'w') as f:
+            json.dump({
+                'version': __version__,
+                'terms': self.terms,
+                'labels': _to_lists(self._labels),
+                'cell_types': _to_lists(self._cell_types),
+                'anatomical_structures': _to_lists(
+                    self._anatomical_structures)
+            }, f)
+
+    @classmethod
+    def load(cls, source):
+        with open(source) as f:
+            data = json.load(f)
+        index = cls()
+        # The biomarker types are saved as JSON lists
+        index.terms = {iri: TermRecord(*record[:-1], tuple(record[-1]))
+                       for iri, record in data['terms'].items()}
+        index._labels = _to_sets(data['labels'])
+        index._cell_types = _to_sets(data['cell_types'])
+        index._anatomical_structures = _to_sets(
+            data['anatomical_structures'])
+        return index
+
+
+def _to_lists(mapping):
+    return {key: sorted(values) for key, values in mapping.items()}
+
+
+def _to_sets(mapping):
+    return {key: set(values) for key, values in mapping.items()}
@@ -0,0 +1,43 @@
+"""Sharing of the RDF nodes built while the rows are converted"""
+from rdflib import URIRef, Literal
+
+
+class TermInterner:
+    """Tables of the IRI and literal nodes of an ontology.
+
+    The same terms, labels and annotation values come back in many rows.
+    Every distinct IRI or literal is built once and the same node object
+    is returned afterwards, instead of a new one for every row. The
+    `requests` counter records how many nodes were asked for, and
+    `allocations` how many were actually built.
+    """
+    def __init__(self):
+        self._iris = {}
+        self._literals = {}
+        self.requests = 0
+
+    def iri(self, value):
+        """Returns the URIRef of the given IRI string"""
+        self.requests += 1
+        node = self._iris.get(value)
+        if node is None:
+            node = self._iris[value] = URIRef(value)
+        return node
+
+    def literal(self, value, datatype=None):
+        """Returns the Literal of the given value and datatype"""
+        self.requests += 1
+        key = (value, datatype)
+        node = self._literals.get(key)
+        if node is None:
+            node = self._literals[key] = Literal(value, datatype=datatype)
+        return node
+
+    @property
+    def allocations(self):
+        return len(self._iris) + len(self._literals)
+
+    def clear(self):
+        self._iris.clear()
+        self._literals.clear()
+        self.requests = 0
@@ -0,0 +1,56 @@
+"""Emission modes of the cell type locations (ccf_located_in edges)"""
+from asctb2ccf.closure import ClosureIndex
+from asctb2ccf.namespace import CCF
+
+
+# all: every cell type of a row is located in every structure of the row
+# leaf: every cell type of a row is located in the last structure of the
+#     row, the other ones are inferred from the partonomy
+# reduced: like leaf, and the locations implied by another location of the
+#     same cell type through the partonomy are also left out
+CELL_LOCATION_MODES = ['all', 'leaf', 'reduced']
+
+
+def reduce_locations(locations, partonomy):
+    """Returns the transitive reduction of the cell type -> set of
+       structures locations, i.e. without the structures that contain
+       another structure of the same cell type, given the ClosureIndex of
+       the partonomy
+    """
+    reduced = {}
+    for cell_type, structures in locations.items():
+        reduced[cell_type] = {
+            structure for structure in structures
+            if not any(partonomy.is_ancestor(structure, other)
+                       for other in structures)}
+    return reduced
+
+
+def get_partonomy(graph):
+    """Returns the ClosureIndex of the ccf_part_of edges of the graph"""
+    return ClosureIndex.from_graph(graph, CCF.ccf_part_of)
+
+
+def get_locations(graph):
+    """Returns the cell type -> set of structures mapping of the graph"""
+    locations = {}
+    for cell_type, _, structure in graph.triples(
+            (None, CCF.ccf_located_in, None)):
+        locations.setdefault(cell_type, set()).add(structure)
+    return locations
+
+
+def reduce_cell_locations(graph):
+    """Removes the ccf_located_in edges of the graph that are implied by
+       another edge of the same cell type and the partonomy. Returns the
+       number of edges removed.
+    """
+    locations = get_locations(graph)
+    reduced = reduce_locations(locations, get_partonomy(graph))
+    count = 0
+    for cell_type, structures in locations.items():
+        for structure in structures - reduced[cell_type]:
+            graph.remove((cell_type, CCF.ccf_located_in, structure))
+            count += 1
+    return count
+
@@ -0,0 +1,212 @@
+"""Merge of the ontologies of several organs into one"""
+import heapq
+import os
+import re
+import tempfile
+from contextlib import ExitStack
+from itertools import islice
+
+from rdflib import Graph
+from rdflib.namespace import OWL, RDF, RDFS
+from rdflib.plugins.serializers.nt import _nt_row
+from rdflib.util import guess_format
+
+from asctb2ccf.formats import COMPRESSIONS, get_compression, open_input,\
+    open_output
+from asctb2ccf.namespace import CCF, OBO, OBOINOWL
+
+
+DEFAULT_BUFFER_SIZE = 500000  # in lines
+
+# The annotations that a term keeps only one value of in the merged
+# ontology, e.g. when two organs give different labels to a cell type. The
+# other ones keep all their values, e.g. a marker that is both a gene and
+# a protein.
+SINGLE_VALUED_ANNOTATIONS = frozenset(f"<{iri}>" for iri in [
+    OBOINOWL.id,
+    CCF.ccf_pref_label,
+    CCF.ccf_asctb_type,
+    CCF.ccf_is_provisional,
+    OBO.IAO_0000115,
+    RDFS.label
+])
+
+_ONTOLOGY_DECLARATION = f"<{RDF.type}> <{OWL.Ontology}> ."
+
+# The blank nodes of the characterizing biomarker sets are named after
+# their content by the converter, so they stand for the same class
+# expression in every organ and are not relabeled
+_CONTENT_ADDRESSED_LABEL = re.compile(r"cbs[0-9a-f]{40}(_\w+)?")
+
+# Runs merged at once, within the limit of open files
+_MAX_OPEN_RUNS = 128
+
+
+def merge(sources, destination, ontology_iri=None, compression=None,
+          buffer_size=DEFAULT_BUFFER_SIZE, temp_dir=None):
+    """Merges the ontology files of several organs into one N-Triples file,
+       with an external sort.
+
+       Every source is read as N-Triples lines, which are sorted in runs of
+       `buffer_size` lines written to temporary files. The runs are then
+       merged, the duplicate lines are dropped and every term keeps a
+       single value of each of the SINGLE_VALUED_ANNOTATIONS, the first one
+       in sorted order. The blank nodes are relabeled per source, except
+       the content-addressed ones of the converter. The N-Triples sources,
+       optionally compressed, are streamed, and the RDF/XML sources are
+       loaded one at a time, with their blank node IDs, so the memory used
+       does not grow with the number of sources. The other formats do not
+       keep the blank node IDs and are rejected with a ValueError.
+
+       When an ontology IRI is given, the ontology declarations of the
+       sources are replaced with the declaration of this IRI. Returns the
+       number of triples written.
+    """
+    check_sources(sources)
+    with tempfile.TemporaryDirectory(dir=temp_dir) as directory:
+        runs = []
+        for position, source in enumerate(sources):
+            lines = _relabel_blank_nodes(_read_lines(source), f"s{position}")
+            if ontology_iri:
+                lines = (line for line in lines
+                         if not _is_ontology_declaration(line))
+            runs.extend(_write_runs(lines, directory, buffer_size))
+        if ontology_iri:
+            runs.extend(_write_runs(
+                iter([f"<{ontology_iri}> {_ONTOLOGY_DECLARATION}\n"]),
+                directory, buffer_size))
+
+        runs = _merge_runs(runs, directory)
+        count = 0
+        with ExitStack() as stack:
+            files = [stack.enter_context(open(run, encoding='ascii'))
+                     for run in runs]
+            output = stack.enter_context(
+                open_output(destination, compression))
+            for line in _resolve_annotations(
+                    _drop_duplicates(heapq.merge(*files))):
+                output.write(line.encode('ascii'))
+                count += 1
+    return count
+
+
+def check_sources(sources):
+    """Raises a ValueError if a source is neither in N-Triples nor in
+       RDF/XML
+    """
+    for source in sources:
+        if _guess_format(source) not in ('nt', 'xml'):
+            raise ValueError(
+                f"{source}: only N-Triples and RDF/XML sources keep the "
+                "labels of their blank nodes, convert it to N-Triples first")
+
+
+def _read_lines(source):
+    """Yields the N-Triples lines of the source file"""
+    format = _guess_format(source)
+    if format == 'nt':
+        with open_input(source) as f:
+            for line in f:
+                line = line.decode('utf-8').strip()
+                if line and not line.startswith('#'):
+                    yield _escape(line) + "\n"
+    else:
+        # The nodeIDs of the RDF/XML blank nodes are kept as their labels
+        graph = Graph()
+        with open_input(source) as f:
+            graph.parse(f, format=format, preserve_bnode_ids=True)
+        for triple in graph:
+            yield _escape(_nt_row(triple))
+
+
+def _guess_format(source):
+    name = str(source)
+    compression = get_compression(name)
+    if compression is not None:
+        name = name[:-len(COMPRESSIONS[compression])]
+    return guess_format(name) or 'xml'
+
+
+def _escape(line):
+    # The same escapes as the N-Triples serializer, so that the same
+    # triple always gives the same line
+    return line.encode('ascii', '_rdflib_nt_escape').decode('ascii')
+
+
+def _relabel_blank_nodes(lines, prefix):
+    for line in lines:
+        subject, predicate, rest = line.split(" ", 2)
+        if subject.startswith("_:"):
+            subject = _relabel(subject, prefix)
+        if rest.startswith("_:"):
+            node, end = rest.split(" ", 1)
+            rest = _relabel(node, prefix) + " " + end
+        yield f"{subject} {predicate} {rest}"
+
+
+def _relabel(node, prefix):
+    label = node[2:]
+    if _CONTENT_ADDRESSED_LABEL.fullmatch(label):
+        return node
+    return f"_:{prefix}x{label}"
+
+
+def _is_ontology_declaration(line):
+    return line.split(" ", 1)[1].startswith(_ONTOLOGY_DECLARATION)
+
+
+def _write_runs(lines, directory, buffer_size):
+    """Writes the lines in sorted runs of at most `buffer_size` lines.
+       Returns the paths of the run files.
+    """
+    runs = []
+    while True:
+        chunk = sorted(set(islice(lines, buffer_size)))
+        if not chunk:
+            return runs
+        fd, path = tempfile.mkstemp(dir=directory, suffix=".nt")
+        with os.fdopen(fd, 'w', encoding='ascii') as f:
+            f.writelines(chunk)
+        runs.append(path)
+
+
+def _merge_runs(runs, directory):
+    """Merges the runs in groups until they can all be opened at once"""
+    while len(runs) > _MAX_OPEN_RUNS:
+        merged = []
+        for start in range(0, len(runs), _MAX_OPEN_RUNS):
+            group = runs[start:start + _MAX_OPEN_RUNS]
+            fd, path = tempfile.mkstemp(dir=directory, suffix=".nt")
+            with ExitStack() as stack:
+                files = [stack.enter_context(open(run, encoding='ascii'))
+                         for run in group]
+                output = stack.enter_context(
+                    os.fdopen(fd, 'w', encoding='ascii'))
+                output.writelines(_drop_duplicates(heapq.merge(*files)))
+            for run in group:
+                os.remove(run)
+            merged.append(path)
+        runs = merged
+    return runs
+
+
+def _drop_duplicates(lines):
+    previous = None
+    for line in lines:
+        if line != previous:
+            yield line
+            previous = line
+
+
+def _resolve_annotations(lines):
+    # The lines of a term, and of a term and an annotation property, are
+    # next to each other in sorted order
+    previous_key = None
+    for line in lines:
+        subject, predicate, _ = line.split(" ", 2)
+        if predicate in SINGLE_VALUED_ANNOTATIONS:
+            key = (subject, predicate)
+            if key == previous_key:
+                continue
+            previous_key = key
+        yield line
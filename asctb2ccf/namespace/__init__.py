@@ -1,3 +1,5 @@
+import warnings
+from types import MappingProxyType
 from typing import List
 from rdflib.term import URIRef, Variable, _is_valid_uri
 
@@ -73,8 +75,31 @@ class DefinedNamespaceMeta(type):
     _extras: List[str] = []  # List of non-pythonesque items
     _underscore_num: bool = False  # True means pass "_n" constructs
 
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        # The URIRefs of the defined terms are built once, into a frozen
+        # term table, and the ones with a Python name are also set as
+        # class attributes, so that accessing them is a plain attribute
+        # lookup that never reaches __getattr__
+        ns = next((c.__dict__["_NS"] for c in cls.__mro__
+                   if "_NS" in c.__dict__), None)
+        terms = {}
+        if ns is not None:
+            for c in reversed(cls.__mro__):
+                if isinstance(c, DefinedNamespaceMeta):
+                    for term in list(c.__dict__.get("__annotations__", {}))\
+                            + list(c.__dict__.get("_extras", [])):
+                        terms[term] = ns[term]
+        type.__setattr__(cls, "_terms", MappingProxyType(terms))
+        for term, uri in terms.items():
+            if term.isidentifier():
+                type.__setattr__(cls, term, uri)
+
     def __getitem__(cls, name, default=None):
         name = str(name)
+        uri = cls._terms.get(name)
+        if uri is not None:
+            return uri
         if str(name).startswith("__"):
             return super().__getitem__(name, default)
         if (cls._warn or cls._fail) and not name in cls:
@@ -106,6 +131,8 @@ class DefinedNamespaceMeta(type):
             return super().__contains__(item)
         if item_str.startswith(str(cls._NS)):
             item_str = item_str[len(str(cls._NS)) :]
+        if item_str in cls._terms:
+            return True
         return any(
             item_str in c.__annotations__
             or item_str in c._extras
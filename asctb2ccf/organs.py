@@ -0,0 +1,186 @@
+"""Registry of the organ root terms that every new ontology starts with"""
+from functools import lru_cache
+
+from rdflib import Literal, URIRef
+from rdflib.namespace import OWL, RDF, RDFS, DCTERMS
+
+from asctb2ccf.curie import CurieResolver
+from asctb2ccf.namespace import OBO, CCF, OBOINOWL
+
+
+BODY = ("UBERON:0013702", "body")
+
+# Organ name -> the root anatomical structures of the organ, as
+# (ID, preferred label, parent ID) tuples. A new organ only needs an entry.
+ORGANS = {
+    'Blood': [
+        ("UBERON:0000178", "blood", "UBERON:0013702")
+    ],
+    'BloodVasculature': [
+        ("UBERON:0004537", "blood vasculature", "UBERON:0013702")
+    ],
+    'BoneMarrow': [
+        ("UBERON:0002371", "bone marrow", "UBERON:0013702")
+    ],
+    'Brain': [
+        ("UBERON:0000955", "brain", "UBERON:0013702")
+    ],
+    'Eye': [
+        ("UBERON:0000970", "eye", "UBERON:0013702"),
+        ("UBERON:0004548", "left eye", "UBERON:0000970"),
+        ("UBERON:0004549", "right eye", "UBERON:0000970")
+    ],
+    'FallopianTube': [
+        ("UBERON:0003889", "fallopian tube", "UBERON:0013702"),
+        ("UBERON:0001303", "left fallopian tube", "UBERON:0003889"),
+        ("UBERON:0001302", "right fallopian tube", "UBERON:0003889")
+    ],
+    'Heart': [
+        ("UBERON:0000948", "heart", "UBERON:0013702")
+    ],
+    'Kidney': [
+        ("UBERON:0002113", "kidney", "UBERON:0013702"),
+        ("UBERON:0004538", "left kidney", "UBERON:0002113"),
+        ("UBERON:0004539", "right kidney", "UBERON:0002113")
+    ],
+    'Knee': [
+        ("UBERON:0001465", "knee", "UBERON:0013702"),
+        ("FMA:24978", "left knee", "UBERON:0001465"),
+        ("FMA:24977", "right knee", "UBERON:0001465")
+    ],
+    'LargeIntestine': [
+        ("UBERON:0000059", "large intestine", "UBERON:0013702")
+    ],
+    'Liver': [
+        ("UBERON:0002107", "liver", "UBERON:0013702")
+    ],
+    'Lung': [
+        ("UBERON:0002048", "lung", "UBERON:0013702"),
+        ("UBERON:0001004", "respiratory system", "UBERON:0002048")
+    ],
+    'LymphNode': [
+        ("UBERON:0000029", "lymph node", "UBERON:0013702"),
+        ("UBERON:0002509", "mesenteric lymph node", "UBERON:0000029")
+    ],
+    'LymphVasculature': [
+        ("UBERON:0004536", "lymph vasculature", "UBERON:0013702")
+    ],
+    'Ovary': [
+        ("UBERON:0000992", "ovary", "UBERON:0013702"),
+        ("FMA:7214", "left ovary", "UBERON:0000992"),
+        ("FMA:7213", "right ovary", "UBERON:0000992")
+    ],
+    'Pancreas': [
+        ("UBERON:0001264", "pancreas", "UBERON:0013702")
+    ],
+    'PeripheralNervousSystem': [
+        ("UBERON:0000010", "peripheral nervous system", "UBERON:0013702")
+    ],
+    'Placenta': [
+        ("UBERON:0001987", "placenta", "UBERON:0013702")
+    ],
+    'Prostate': [
+        ("UBERON:0002367", "prostate", "UBERON:0013702")
+    ],
+    'Skin': [
+        ("UBERON:0001003", "skin", "UBERON:0013702")
+    ],
+    'SmallIntestine': [
+        ("UBERON:0002108", "small intestine", "UBERON:0013702")
+    ],
+    'Spleen': [
+        ("UBERON:0002106", "spleen", "UBERON:0013702")
+    ],
+    'Thymus': [
+        ("UBERON:0002370", "thymus", "UBERON:0013702")
+    ],
+    'Ureter': [
+        ("UBERON:0000056", "ureter", "UBERON:0013702"),
+        ("UBERON:0001223", "left ureter", "UBERON:0000056"),
+        ("UBERON:0001222", "right ureter", "UBERON:0000056")
+    ],
+    'UrinaryBladder': [
+        ("UBERON:0001255", "urinary bladder", "UBERON:0013702")
+    ],
+    'Uterus': [
+        ("UBERON:0000995", "uterus", "UBERON:0013702")
+    ],
+    'SpinalCord': [
+        ("UBERON:0002240", "spinal cord", "UBERON:0013702")
+    ],
+    'MammaryGland': [
+        ("UBERON:0001911", "mammary gland", "UBERON:0013702"),
+        ("FMA:57991", "left mammary gland", "UBERON:0001911"),
+        ("FMA:57987", "right mammary gland", "UBERON:0001911"),
+        ("UBERON:0000310", "breast", "UBERON:0013702")
+    ],
+    'Pelvis': [
+        ("UBERON:0001270", "pelvis", "UBERON:0013702")
+    ],
+    'PalatineTonsil': [
+        ("UBERON:0002373", "palatine tonsil", "UBERON:0013702"),
+        ("FMA:54974", "left palatine tonsil", "UBERON:0002373"),
+        ("FMA:54973", "right palatine tonsil", "UBERON:0002373")
+    ],
+    'Larynx': [
+        ("UBERON:0001737", "larynx", "UBERON:0013702")
+    ]
+}
+
+# Top-level classes of the reference ontologies, as (IRI, CCF class)
+_DEFAULT_CLASS_HIERARCHY = [
+    ("http://purl.obolibrary.org/obo/UBERON_0001062", CCF.AnatomicalStructure),
+    ("http://purl.org/sig/ont/fma/fma62955", CCF.AnatomicalStructure),
+    ("http://purl.obolibrary.org/obo/CL_0000000", CCF.CellType),
+    ("http://purl.obolibrary.org/obo/LMHA_00135", CCF.CellType),
+    ("http://purl.bioontology.org/ontology/HGNC/gene", CCF.Biomarker)
+]
+
+_ANNOTATION_PROPERTIES = [
+    DCTERMS.references,
+    OBO.IAO_0000115,
+    OBOINOWL.id,
+    CCF.ccf_pref_label,
+    CCF.ccf_part_of,
+    CCF.ccf_located_in,
+    CCF.ccf_characterizes,
+    CCF.ccf_asctb_type,
+    CCF.ccf_ct_isa,
+    CCF.ccf_is_provisional
+]
+
+_resolver = CurieResolver()
+
+
+@lru_cache(maxsize=None)
+def get_seed_triples(organ_name):
+    """Returns the triples every ontology of the given organ starts with,
+       except the ontology declaration. They are compiled once per organ.
+       Unknown organs only get the body as their root.
+    """
+    triples = []
+    for iri, ccf_class in _DEFAULT_CLASS_HIERARCHY:
+        triples.append((URIRef(iri), RDF.type, OWL.Class))
+        triples.append((URIRef(iri), RDFS.subClassOf, ccf_class))
+
+    body_id, body_label = BODY
+    triples.extend(_get_term_triples(body_id, body_label))
+    for term_id, pref_label, parent_id in ORGANS.get(organ_name, []):
+        triples.extend(_get_term_triples(term_id, pref_label, parent_id))
+
+    for annotation_property in _ANNOTATION_PROPERTIES:
+        triples.append(
+            (annotation_property, RDF.type, OWL.AnnotationProperty))
+    return tuple(triples)
+
+
+def _get_term_triples(term_id, pref_label, parent_id=None):
+    iri = URIRef(_resolver.resolve(term_id, 'AS'))
+    triples = [(iri, RDF.type, OWL.Class),
+               (iri, OBOINOWL.id, Literal(term_id)),
+               (iri, CCF.ccf_asctb_type, Literal("AS")),
+               (iri, CCF.ccf_pref_label, Literal(pref_label))]
+    if parent_id is not None:
+        parent_iri = URIRef(_resolver.resolve(parent_id, 'AS'))
+        triples.append((iri, CCF.ccf_part_of, parent_iri))
+    return triples
@@ -1,42 +1,395 @@
 import json
 import logging
+import math
 import pkg_resources
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
+from rdflib import Graph
+
+import asctb2ccf
+from asctb2ccf.cache import BuildCache, DEFAULT_TTL, DEFAULT_BUILD_CACHE_SIZE
 from asctb2ccf.client import AsctbReporterClient
+from asctb2ccf.closure import materialize_closure
+from asctb2ccf.formats import get_compression, open_output, write_lines
+from asctb2ccf.incremental import RowSnapshot, get_lines
+from asctb2ccf.index import TermIndex
+from asctb2ccf.locations import reduce_cell_locations
 from asctb2ccf.ontology import BSOntology
+from asctb2ccf.profiling import Profiler, stage
+from asctb2ccf.reader import read_csv
+from asctb2ccf.registry import ProvisionalIdRegistry
+from asctb2ccf.store import SQLiteStore
+from asctb2ccf.validation import ERROR, get_invalid_rows, validate_rows,\
+    write_report
+from asctb2ccf.writer import NTriplesWriter
 
 
-def run(args):
-    """
+# The options added to the command line after the organ name, Google Sheet
+# URL, ontology IRI, cell biomarkers only flag and output, with the
+# defaults of the command line
+DEFAULT_OPTIONS = {
+    'input_csv': None,
+    'cell_location': 'all',
+    'closure': False,
+    'index': False,
+    'format': None,
+    'compress': None,
+    'validate': False,
+    'validation_report': None,
+    'validate_only': False,
+    'streaming': False,
+    'shards': 1,
+    'store': False,
+    'incremental': False,
+    'profile': False,
+    'id_registry': None,
+    'release': None,
+    'cache_dir': None,
+    'cache_ttl': DEFAULT_TTL,
+    'offline': False,
+    'build_cache': None,
+    'build_cache_size': DEFAULT_BUILD_CACHE_SIZE,
+    'manifest': None
+}
+
+
+def with_defaults(args, defaults=DEFAULT_OPTIONS):
+    """Returns a copy of the arguments with the default value of every
+       option they lack, e.g. for the callers that build the arguments of
+       an earlier version of the command line
     """
-    client = AsctbReporterClient()
+    return Namespace(**{**defaults, **vars(args)})
+
 
+def run(args, profiler=None, rows=None):
+    """Converts the ASCT+B table of an organ as set by the command line
+       arguments, or the given rows when already fetched. When
+       `args.profile` is set, or a Profiler is given, the time of every
+       stage is recorded, and with `args.profile` the report is written
+       next to the output as <output>.profile.json. The options missing
+       from `args` take their DEFAULT_OPTIONS value.
+    """
+    args = with_defaults(args)
     ontology_iri = args.ontology_iri
-    gsheet_url = args.gsheet_url
     organ_name = args.organ_name
+    if args.streaming and args.format not in (None, 'nt'):
+        raise ValueError("The streaming mode only writes N-Triples")
+    if args.cell_location == 'reduced':
+        # The reduction needs the locations of all the rows
+        if args.incremental:
+            raise ValueError("The reduced cell locations cannot be rebuilt "
+                             "incrementally")
+        if args.streaming and args.shards > 1:
+            raise ValueError("The reduced cell locations cannot be "
+                             "streamed from shards")
+    if args.closure:
+        # So does the closure, with the hierarchies of all the rows
+        if args.incremental:
+            raise ValueError("The closure cannot be rebuilt incrementally")
+        if args.streaming and args.shards > 1:
+            raise ValueError("The closure cannot be streamed from shards")
+    if args.incremental and args.shards > 1:
+        raise ValueError("The incremental rebuild does not convert the rows "
+                         "in shards")
+    if args.index and args.incremental:
+        # The unchanged rows are not converted again
+        raise ValueError("The term index cannot be built incrementally")
+
+    if profiler is None and args.profile:
+        profiler = Profiler()
+    if profiler is not None:
+        profiler.start()
+
+    with stage(profiler, 'fetch'):
+        if rows is None:
+            rows = _get_rows(args)
+        if profiler is not None or args.build_cache or _validates(args):
+            # The CSV rows are read lazily otherwise
+            rows = list(rows)
+
+    if _validates(args):
+        with stage(profiler, 'validate'):
+            rows = _validate(rows, args)
+        if args.validate_only:
+            _stop_profiler(profiler, args, None)
+            return
+
+    build_cache = None
+    if args.build_cache:
+        build_cache = BuildCache(args.build_cache, args.build_cache_size)
+        key = build_cache.key(
+            rows, organ_name, ontology_iri,
+            ('cell-biomarkers' if args.cell_biomarkers_only else 'full')
+            + f"/{args.cell_location}" + ("/closure" if args.closure else ""),
+            args.format or ('nt' if args.streaming else 'xml'),
+            get_compression(args.output, args.compress))
+        if (not args.index
+                or build_cache.fetch(f"{key}.index",
+                                     f"{args.output}.index.json"))\
+                and build_cache.fetch(key, args.output):
+            logging.info(f"Build cache hit for {organ_name}, "
+                         f"{args.output} is up to date")
+            _stop_profiler(profiler, args, None)
+            return
+        logging.info(f"Build cache miss for {organ_name}, converting")
+
+    registry = None
+    if args.id_registry:
+        registry = ProvisionalIdRegistry(args.id_registry, organ_name,
+                                         args.release)
+
+    store = 'default'
+    if args.store:
+        # The store is rebuilt from scratch, without maintaining its
+        # indexes until all the triples are loaded
+        store = SQLiteStore(f"{args.output}.store")
+        store.remove((None, None, None))
+        store.begin_bulk_load()
 
-    o = BSOntology.new(organ_name, ontology_iri)
-
-    if (gsheet_url):
-        if args.cell_biomarkers_only:
-            response = client.get_data_by_gsheet_url(gsheet_url)
-            for index, data_item in enumerate(response['data']):
-                try:
-                    o = o.mutate_cell_biomarker(data_item)
-                except ValueError as e:
-                    logging.warning(str(e) +
-                        f", row {index}, in <spreadsheet> {organ_name}")
+    index = TermIndex() if args.index else None
+
+    with stage(profiler, 'new'):
+        o = BSOntology.new(organ_name, ontology_iri, registry=registry,
+                           store=store, cell_location=args.cell_location,
+                           closure=args.closure, index=index)
+
+    if args.incremental:
+        with stage(profiler, 'mutate'):
+            snapshot = _update_snapshot(o, rows, args, profiler)
+        triples = len(snapshot)
+        with stage(profiler, 'serialize'):
+            _write_snapshot(o, snapshot, args)
+        snapshot.close()
+    elif args.streaming:
+        def flush(o):
+            with stage(profiler, 'write'):
+                o.flush(writer)
+
+        with NTriplesWriter(args.output, args.compress) as writer:
+            flush(o)
+            # The mutate stage includes the write stage here
+            with stage(profiler, 'mutate'):
+                if args.shards > 1:
+                    for shard_triples in _mutate_in_shards(
+                            rows, args, index, profiler):
+                        for triple in shard_triples:
+                            writer.add(triple)
+                else:
+                    o = _mutate(o, rows, args, on_row_done=flush,
+                                profiler=profiler)
+                    flush(o.finish())
+            triples = len(writer)
+    else:
+        with stage(profiler, 'mutate'):
+            if args.shards > 1:
+                graph = o.graph
+                for shard_triples in _mutate_in_shards(rows, args, index,
+                                                       profiler):
+                    graph.addN((s, p, obj, graph)
+                               for s, p, obj in shard_triples)
+                if args.cell_location == 'reduced':
+                    # Every shard is reduced on its own, the locations
+                    # implied across shards are removed once merged
+                    reduce_cell_locations(graph)
+                if args.closure:
+                    materialize_closure(graph)
+            else:
+                o = _mutate(o, rows, args, profiler=profiler).finish()
+        if args.store:
+            # The loaded store is serialized read-only
+            store.close()
+            store = SQLiteStore(f"{args.output}.store", read_only=True)
+            o = BSOntology(Graph(store))
+        triples = len(o.graph)
+        with stage(profiler, 'serialize'):
+            o.serialize(args.output, args.format or 'xml', args.compress)
+    if registry is not None:
+        registry.close()
+    if index is not None:
+        index.save(f"{args.output}.index.json")
+    if args.store:
+        store.close()
+    if build_cache is not None:
+        build_cache.put(key, args.output)
+        if index is not None:
+            build_cache.put(f"{key}.index", f"{args.output}.index.json")
+
+    _stop_profiler(profiler, args, triples)
+
+
+def _validates(args):
+    return args.validate or args.validate_only or args.validation_report
+
+
+def _validate(rows, args):
+    """Checks all the rows before the conversion, and writes the report of
+       the problems found if requested. Returns the rows without errors.
+    """
+    problems = validate_rows(rows, args.cell_biomarkers_only)
+    for problem in problems:
+        message = f"{problem.problem}, row {problem.row}, " \
+                  f"in <spreadsheet> {args.organ_name}"
+        if problem.severity == ERROR:
+            logging.warning(message)
         else:
-            response = client.get_data_by_gsheet_url(gsheet_url)
-            for index, data_item in enumerate(response['data']):
-                try:
-                    o = o.mutate_anatomical_structure(data_item)
-                    o = o.mutate_cell_type(data_item)
-                    o = o.mutate_biomarker(data_item)
-                    o = o.mutate_partonomy(data_item)
-                    o = o.mutate_cell_hierarchy(data_item)
-                    o = o.mutate_cell_location(data_item)
-                except ValueError as e:
-                    logging.warning(str(e) +
-                        f", row {index}, in <spreadsheet> {organ_name}")
-    o.serialize(args.output)
+            logging.info(f"{message} ({problem.column}: {problem.value})")
+    if args.validation_report:
+        write_report(problems, args.validation_report)
+    invalid_rows = get_invalid_rows(problems)
+    return [data_item for index, data_item in enumerate(rows)
+            if index not in invalid_rows]
+
+
+def _stop_profiler(profiler, args, triples):
+    if profiler is not None:
+        profiler.triples = triples
+        profiler.stop()
+        if args.profile and args.output:
+            profiler.write(f"{args.output}.profile.json")
+
+
+def _mutate(o, rows, args, on_row_done=None, profiler=None):
+    methods = _get_methods(args)
+    for index, data_item in enumerate(rows):
+        o = _mutate_row(o, index, data_item, args, methods, profiler)
+        if on_row_done is not None:
+            on_row_done(o)
+    return o
+
+
+def _mutate_in_shards(rows, args, index=None, profiler=None):
+    """Splits the rows into `args.shards` shards of consecutive rows and
+       converts them in as many worker processes. Yields the triples of
+       every shard, in the shard order, to be merged into one graph. The
+       term index and the rows and method timings of every shard are
+       merged into the given index and profiler.
+    """
+    rows = list(rows)
+    shard_size = max(1, math.ceil(len(rows) / args.shards))
+    shards = [(start, rows[start:start + shard_size])
+              for start in range(0, len(rows), shard_size)]
+    with ProcessPoolExecutor(max_workers=args.shards) as executor:
+        for shard_triples, shard_index, shard_profiler in executor.map(
+                _build_shard, repeat(args), shards,
+                repeat(profiler is not None)):
+            if index is not None:
+                index.update(shard_index)
+            if profiler is not None:
+                profiler.merge(shard_profiler)
+            yield shard_triples
+
+
+def _build_shard(args, shard, profiled=False):
+    """Returns the triples, the term index (or None) and the profiler (or
+       None) of the given (first row index, rows) shard. The terms shared
+       with other shards produce the same triples, and the blank nodes of
+       the characterizing biomarker sets are named after their content, so
+       the shards merge without duplicates or collisions.
+    """
+    start, rows = shard
+    registry = None
+    if args.id_registry:
+        registry = ProvisionalIdRegistry(args.id_registry, args.organ_name,
+                                         args.release)
+    # The closure is only complete once the shards are merged
+    o = BSOntology(Graph(), registry=registry,
+                   cell_location=args.cell_location, closure=False,
+                   index=TermIndex() if args.index else None)
+    # The shard times its methods only, the stages and the memory are
+    # profiled in the parent process
+    profiler = Profiler() if profiled else None
+    methods = _get_methods(args)
+    for index, data_item in enumerate(rows, start):
+        o = _mutate_row(o, index, data_item, args, methods, profiler)
+    o = o.finish()
+    if registry is not None:
+        registry.close()
+    return list(o.graph), o.index, profiler
+
+
+def _mutate_row(o, index, data_item, args, methods, profiler=None):
+    try:
+        for method in methods:
+            if profiler is None:
+                o = getattr(o, method)(data_item)
+            else:
+                o = profiler.call(method, getattr(o, method), data_item)
+    except ValueError as e:
+        logging.warning(str(e) +
+            f", row {index}, in <spreadsheet> {args.organ_name}")
+        if profiler is not None:
+            profiler.invalid_rows += 1
+    if profiler is not None:
+        profiler.rows += 1
+    return o
+
+
+def _get_methods(args):
+    # The same methods are timed when profiling, so that the profile
+    # measures the conversion as it runs otherwise
+    if args.cell_biomarkers_only:
+        return ['mutate_cell_biomarker']
+    return ['apply_row']
+
+
+def _update_snapshot(o, rows, args, profiler=None):
+    """Updates the row snapshot of the previous run, kept next to the output
+       as <output>.state, converting only the new and changed rows
+    """
+    snapshot = RowSnapshot(f"{args.output}.state", {
+        'cell_biomarkers_only': bool(args.cell_biomarkers_only),
+        'cell_location': args.cell_location,
+        'version': asctb2ccf.__version__})
+    methods = _get_methods(args)
+
+    # The seed triples are handled as one more row, before the table rows
+    seed_lines = get_lines(o.graph)
+    seed = {'seed': sorted(seed_lines)}
+
+    def convert_row(index, data_item):
+        if data_item is seed:
+            return seed_lines
+        # Every row is converted in a graph of its own so that all the
+        # triples it contributes are known, including the shared ones
+        row_o = BSOntology(Graph(), resolver=o.resolver, registry=o.registry,
+                           cell_location=args.cell_location,
+                           interner=o.interner)
+        row_o = _mutate_row(row_o, index - 1, data_item, args, methods,
+                            profiler)
+        return get_lines(row_o.graph)
+
+    added, removed = snapshot.update([seed] + list(rows), convert_row)
+    logging.info(f"Incremental rebuild of {args.organ_name}: "
+                 f"{added} rows added, {removed} rows removed")
+    return snapshot
+
+
+def _write_snapshot(o, snapshot, args):
+    format = args.format or ('nt' if args.streaming else 'xml')
+    if format in ('nt', 'nt-sorted'):
+        # The lines are written as is, which keeps the blank node labels
+        lines = snapshot.lines()
+        if format == 'nt-sorted':
+            lines = sorted(lines)
+        with open_output(args.output, args.compress) as f:
+            write_lines(f, lines)
+    else:
+        o.graph.parse(data="".join(snapshot.lines()), format='nt')
+        o.serialize(args.output, format, args.compress)
+
+
+def _get_rows(args):
+    """Returns the ASCT+B table rows, either parsed from the local CSV file
+       or fetched from the ASCT+B Reporter API
+    """
+    if args.input_csv:
+        return read_csv(args.input_csv)
+    if args.gsheet_url:
+        client = AsctbReporterClient(cache_dir=args.cache_dir,
+                                     cache_ttl=args.cache_ttl,
+                                     offline=args.offline)
+        response = client.get_data_by_gsheet_url(args.gsheet_url)
+        return response['data']
+    return []
@@ -0,0 +1,134 @@
+"""Instrumentation of the conversion stages"""
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class Profiler:
+    """Records where the time of a conversion goes.
+
+    The wall and CPU time is accumulated per stage (e.g. fetch, mutate,
+    serialize) and per ontology method, together with the number of rows
+    converted, the rows that raised a ValueError, the triples written and
+    the peak memory. The peak memory is the peak resident set size of the
+    process, or the peak traced by tracemalloc between `start` and `stop`
+    with `trace_memory`.
+
+    Args:
+        trace_memory (bool): Whether to trace the peak memory with
+            tracemalloc, which slows down every stage timed meanwhile
+    """
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.methods = {}
+        self.rows = 0
+        self.invalid_rows = 0
+        self.triples = 0
+        self.peak_memory = None
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self._start_times = None
+        self._is_tracing = False
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._is_tracing = True
+        self._start_times = (time.perf_counter(), time.process_time())
+
+    def stop(self):
+        wall, cpu = self._start_times
+        self.wall_time = time.perf_counter() - wall
+        self.cpu_time = time.process_time() - cpu
+        if self._is_tracing:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self._is_tracing = False
+        elif resource is not None:
+            self.peak_memory = _get_max_rss()
+
+    @contextmanager
+    def stage(self, name):
+        """Records the time spent in the block under the given stage.
+           The time of a stage entered several times is accumulated.
+        """
+        start_times = (time.perf_counter(), time.process_time())
+        try:
+            yield
+        finally:
+            self._record(self.stages, name, start_times)
+
+    def call(self, name, function, *args):
+        """Calls the function with the given arguments and records its time
+           under the given method name. Returns the function result.
+        """
+        start_times = (time.perf_counter(), time.process_time())
+        try:
+            return function(*args)
+        finally:
+            self._record(self.methods, name, start_times)
+
+    def merge(self, other):
+        """Adds the rows and the method timings recorded by another
+           profiler, e.g. in a shard worker. The method times of the shards
+           converted in parallel add up beyond the wall time of the stage.
+        """
+        self.rows += other.rows
+        self.invalid_rows += other.invalid_rows
+        for name, timing in other.methods.items():
+            merged = self.methods.setdefault(
+                name, {'calls': 0, 'wall_time': 0.0, 'cpu_time': 0.0})
+            for key, value in timing.items():
+                merged[key] += value
+
+    def report(self):
+        """Returns the measurements as a JSON-serializable dict"""
+        mutate_time = self.stages.get('mutate', {}).get('wall_time', 0.0)
+        return {
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'rows': self.rows,
+            'invalid_rows': self.invalid_rows,
+            'rows_per_second': self.rows / mutate_time if mutate_time else 0,
+            'triples': self.triples,
+            'peak_memory': self.peak_memory,
+            'stages': self.stages,
+            'methods': self.methods
+        }
+
+    def write(self, destination):
+        """Writes the report to the given JSON file"""
+        with open(destination, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def _record(self, timings, name, start_times):
+        wall, cpu = start_times
+        timing = timings.setdefault(
+            name, {'calls': 0, 'wall_time': 0.0, 'cpu_time': 0.0})
+        timing['calls'] += 1
+        timing['wall_time'] += time.perf_counter() - wall
+        timing['cpu_time'] += time.process_time() - cpu
+
+
+def _get_max_rss():
+    """Returns the peak resident set size of the process, in bytes"""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # In bytes on macOS, in kilobytes elsewhere
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def stage(profiler, name):
+    """Returns the `profiler.stage` context manager, or one doing nothing
+       when the profiler is None
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(name)
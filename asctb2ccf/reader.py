@@ -0,0 +1,119 @@
+"""Reader of the ASCT+B table CSV exports
+
+Parses the CSV export of an ASCT+B Google Sheet into the same row objects
+returned by the ASCT+B Reporter API, so the rows can be fed directly to
+the BSOntology `mutate_*` methods without calling the remote service.
+"""
+import csv
+import re
+
+
+# The column header looks like AS/1, AS/1/LABEL, AS/1/ID, BGene/2/ID,
+# REF/1/DOI, etc.
+_COLUMN_PATTERN = re.compile(
+    r"^(AS|CT|BGene|BProtein|BLipid|BMetabolites|BProteoform|REF)"
+    r"/(\d+)(?:/(LABEL|ID|DOI|NOTES?))?$",
+    re.IGNORECASE)
+
+_BIOMARKER_TYPES = {
+    'bgene': 'gene',
+    'bprotein': 'protein',
+    'blipid': 'lipids',
+    'bmetabolites': 'metabolites',
+    'bproteoform': 'proteoforms'
+}
+
+
+def read_csv(path):
+    """Yields the ASCT+B table rows stored in the given CSV file.
+
+    Args:
+        path (str): The path to the CSV export of the ASCT+B table
+
+    Returns:
+        A generator of the table rows, in the ASCT+B Reporter API format
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from read_rows(f)
+
+
+def read_rows(lines):
+    """Yields the ASCT+B table rows parsed from an iterable of CSV lines,
+       e.g. an open file or the lines of an HTTP response.
+
+    The rows before the column header (title, authors, etc.) are skipped.
+    Each row is yielded as soon as it is parsed.
+    """
+    reader = csv.reader(lines)
+    columns = None
+    for values in reader:
+        if columns is None:
+            if values and _COLUMN_PATTERN.match(values[0].strip()):
+                columns = _parse_header(values)
+            continue
+        row = _parse_row(columns, values)
+        if row is not None:
+            yield row
+    if columns is None:
+        raise ValueError("Missing the ASCT+B table header (AS/1, ...)")
+
+
+def _parse_header(values):
+    columns = []
+    for index, value in enumerate(values):
+        match = _COLUMN_PATTERN.match(value.strip())
+        if match:
+            family, number, field = match.groups()
+            field = (field or 'NAME').upper()
+            columns.append((index, family.lower(), int(number), field))
+    return columns
+
+
+def _parse_row(columns, values):
+    entries = {}
+    for index, family, number, field in columns:
+        value = values[index].strip() if index < len(values) else ''
+        entry = entries.setdefault((family, number), {})
+        entry[field] = value
+    if not any(value for entry in entries.values()
+               for value in entry.values()):
+        return None  # blank line
+
+    row = {
+        'anatomical_structures': [],
+        'cell_types': [],
+        'references': []
+    }
+    for b_type in _BIOMARKER_TYPES.values():
+        row['biomarkers_' + b_type] = []
+
+    for (family, _), entry in sorted(entries.items(),
+                                     key=lambda item: item[0][1]):
+        if not any(entry.values()):
+            continue
+        if family == 'as':
+            row['anatomical_structures'].append(_to_term(entry))
+        elif family == 'ct':
+            row['cell_types'].append(_to_term(entry))
+        elif family == 'ref':
+            row['references'].append({
+                'id': entry.get('ID', ''),
+                # The REF/n column holds the DOI when there is no REF/n/DOI
+                'doi': entry.get('DOI') or entry.get('NAME', ''),
+                'notes': entry.get('NOTES', entry.get('NOTE', ''))
+            })
+        else:
+            marker = _to_term(entry)
+            marker['b_type'] = _BIOMARKER_TYPES[family]
+            row['biomarkers_' + marker['b_type']].append(marker)
+    row['biomarkers'] = [marker for b_type in _BIOMARKER_TYPES.values()
+                         for marker in row['biomarkers_' + b_type]]
+    return row
+
+
+def _to_term(entry):
+    return {
+        'name': entry.get('NAME', ''),
+        'id': entry.get('ID', ''),
+        'rdfs_label': entry.get('LABEL', '')
+    }
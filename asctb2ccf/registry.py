@@ -0,0 +1,140 @@
+"""Registry of the provisional (ASCTB-TEMP) term IDs"""
+import logging
+import re
+import sqlite3
+
+
+_NON_WORD_PATTERN = re.compile('\\W+')
+_INVALID_CHAR_PATTERN = re.compile('[^a-z0-9-]+')
+
+
+def generate_provisional_id(label):
+    """Returns the ASCTB-TEMP ID derived from the term label, e.g.
+       'Loop of Henle' -> 'ASCTB-TEMP:loop-of-henle'
+    """
+    slug = label.strip().lower()
+    slug = _NON_WORD_PATTERN.sub('-', slug)
+    slug = _INVALID_CHAR_PATTERN.sub('', slug)
+    return f'ASCTB-TEMP:{slug}'
+
+
+def normalize_label(label):
+    return ' '.join(label.split()).lower()
+
+
+class ProvisionalIdRegistry:
+    """Maps the labels of provisional terms to stable ASCTB-TEMP IDs.
+
+    The IDs are memoized in the process. When a SQLite file is given, the
+    mapping is also persisted so that every organ and release reuses the
+    ID assigned the first time a label was seen, even if the label
+    spelling or the ID generation changes later. The registry records
+    which organs and releases use each ID, and flags the collisions where
+    different labels are given the same ID.
+
+    Args:
+        path (str): The SQLite file of the registry. The IDs are only
+            memoized in the process when omitted.
+        organ_name (str): The organ recorded as the user of the IDs
+        release (str): The release recorded as the user of the IDs
+    """
+    def __init__(self, path=None, organ_name=None, release=None):
+        self.organ_name = organ_name or ''
+        self.release = release or ''
+        self._ids = {}  # normalized label -> ID
+        self._labels = {}  # ID -> normalized label
+        self._collisions = {}  # ID -> normalized labels
+        self.connection = None
+        if path:
+            self.connection = sqlite3.connect(path, timeout=60)
+            self._create_tables()
+
+    def get_id(self, label):
+        """Returns the ASCTB-TEMP ID of the given term label"""
+        key = normalize_label(label)
+        provisional_id = self._ids.get(key)
+        if provisional_id is None:
+            provisional_id = self._assign_id(key, label)
+            self._ids[key] = provisional_id
+        return provisional_id
+
+    def collisions(self):
+        """Returns the IDs shared by different labels, as a dict of
+           ID -> list of labels
+        """
+        collisions = {}
+        if self.connection is not None:
+            for provisional_id, label in self.connection.execute(
+                    "SELECT id, label FROM collision ORDER BY id, label"):
+                collisions.setdefault(provisional_id, []).append(label)
+        else:
+            for provisional_id, labels in self._collisions.items():
+                collisions[provisional_id] = sorted(labels)
+        return collisions
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _assign_id(self, key, label):
+        if self.connection is None:
+            provisional_id = generate_provisional_id(label)
+            other_key = self._labels.setdefault(provisional_id, key)
+            if other_key != key:
+                self._flag_collision(provisional_id, [other_key, key])
+            return provisional_id
+
+        with self.connection:
+            row = self.connection.execute(
+                "SELECT id FROM provisional_id WHERE label = ?",
+                (key,)).fetchone()
+            if row is not None:
+                provisional_id = row[0]
+            else:
+                provisional_id = generate_provisional_id(label)
+                other_keys = [other_key for (other_key,)
+                              in self.connection.execute(
+                                  "SELECT label FROM provisional_id "
+                                  "WHERE id = ?", (provisional_id,))]
+                self.connection.execute(
+                    "INSERT OR IGNORE INTO provisional_id (label, id) "
+                    "VALUES (?, ?)", (key, provisional_id))
+                # Another process may have registered the label meanwhile
+                provisional_id = self.connection.execute(
+                    "SELECT id FROM provisional_id WHERE label = ?",
+                    (key,)).fetchone()[0]
+                if other_keys:
+                    self._flag_collision(provisional_id, other_keys + [key])
+            self.connection.execute(
+                "INSERT OR IGNORE INTO usage (id, organ, release) "
+                "VALUES (?, ?, ?)",
+                (provisional_id, self.organ_name, self.release))
+        return provisional_id
+
+    def _flag_collision(self, provisional_id, keys):
+        logging.warning(f"Provisional ID collision: {provisional_id} is "
+                        "used by the labels " + ", ".join(
+                            f"'{key}'" for key in keys))
+        self._collisions.setdefault(provisional_id, set()).update(keys)
+        if self.connection is not None:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO collision (id, label) VALUES (?, ?)",
+                [(provisional_id, key) for key in keys])
+
+    def _create_tables(self):
+        with self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS provisional_id ("
+                "label TEXT PRIMARY KEY, id TEXT NOT NULL)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS provisional_id_by_id "
+                "ON provisional_id (id)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                "id TEXT, organ TEXT, release TEXT, "
+                "PRIMARY KEY (id, organ, release))")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS collision ("
+                "id TEXT, label TEXT, PRIMARY KEY (id, label))")
@@ -0,0 +1,301 @@
+"""Disk-backed rdflib store on top of SQLite"""
+import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
+
+from rdflib import BNode, Literal, URIRef
+from rdflib.store import Store, VALID_STORE, NO_STORE
+
+
+DEFAULT_BATCH_SIZE = 100000
+DEFAULT_CACHE_SIZE = 1 << 18
+
+# Term kinds
+_URI = 'U'
+_BNODE = 'B'
+_LITERAL = 'L'
+
+_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS triple_spo ON triple (s, p, o)",
+    "CREATE INDEX IF NOT EXISTS triple_pos ON triple (p, o)",
+    "CREATE INDEX IF NOT EXISTS triple_os ON triple (o, s)"
+]
+
+
+class SQLiteStore(Store):
+    """An rdflib store keeping the triples in a SQLite file instead of memory,
+    so that the size of a graph is only limited by the disk space.
+
+    The terms are stored once in their own table and the triples refer to
+    them by ID. The writes are committed in batches of `batch_size`
+    triples. Within `bulk_load`, the indexes are dropped and only rebuilt
+    once all the triples are loaded, which makes loading much faster. The
+    store can also be opened read-only, e.g. to serialize or query a graph
+    built by another process.
+
+    Args:
+        configuration (str): The SQLite file of the store, opened at once
+            when given
+        read_only (bool): Whether to open the store read-only
+        batch_size (int): The number of triples written per transaction
+        cache_size (int): The number of term IDs cached in memory
+    """
+    context_aware = False
+    formula_aware = False
+    transaction_aware = True
+    graph_aware = False
+
+    def __init__(self, configuration=None, identifier=None, read_only=False,
+                 batch_size=DEFAULT_BATCH_SIZE,
+                 cache_size=DEFAULT_CACHE_SIZE):
+        self.read_only = read_only
+        self.batch_size = batch_size
+        self.connection = None
+        self.is_bulk_loading = False
+        self._pending = 0
+        self._namespaces = {}  # prefix -> namespace
+        self._prefixes = {}  # namespace -> prefix
+        self.cache_size = cache_size
+        self._term_ids = {}  # node -> term ID
+        self._get_term = lru_cache(maxsize=cache_size)(self._find_term)
+        super().__init__(configuration, identifier)
+
+    def open(self, configuration, create=True):
+        """Opens the SQLite file, creating the tables if `create` is set.
+           Returns NO_STORE if a read-only store does not exist.
+        """
+        try:
+            if self.read_only:
+                self.connection = sqlite3.connect(
+                    f"file:{configuration}?mode=ro", uri=True)
+            else:
+                self.connection = sqlite3.connect(configuration)
+        except sqlite3.OperationalError:
+            return NO_STORE
+        if create and not self.read_only:
+            self._create_tables()
+        self._namespaces = {}
+        self._prefixes = {}
+        for prefix, namespace in self.connection.execute(
+                "SELECT prefix, namespace FROM namespace"):
+            self._namespaces[prefix] = URIRef(namespace)
+            self._prefixes[URIRef(namespace)] = prefix
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction=True):
+        if self.connection is None:
+            return
+        if self.is_bulk_loading:
+            self.end_bulk_load()
+        if commit_pending_transaction:
+            self.commit()
+        else:
+            self.rollback()
+        self.connection.close()
+        self.connection = None
+
+    def commit(self):
+        if not self.read_only:
+            self.connection.commit()
+        self._pending = 0
+
+    def rollback(self):
+        self.connection.rollback()
+        # The cached IDs of the terms added since the last commit are gone
+        self._term_ids.clear()
+        self._get_term.cache_clear()
+        self._pending = 0
+
+    @contextmanager
+    def bulk_load(self):
+        """Loads the triples added within the block without maintaining the
+           indexes, which are rebuilt when the block exits
+        """
+        self.begin_bulk_load()
+        try:
+            yield self
+        finally:
+            self.end_bulk_load()
+
+    def begin_bulk_load(self):
+        self.commit()
+        for (name,) in self.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = 'triple'").fetchall():
+            self.connection.execute(f"DROP INDEX {name}")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.is_bulk_loading = True
+
+    def end_bulk_load(self):
+        self.is_bulk_loading = False
+        # The duplicates are only skipped by the unique index
+        self.connection.execute(
+            "DELETE FROM triple WHERE rowid NOT IN "
+            "(SELECT MIN(rowid) FROM triple GROUP BY s, p, o)")
+        for statement in _INDEXES:
+            self.connection.execute(statement)
+        self.commit()
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+
+    def add(self, triple, context=None, quoted=False):
+        Store.add(self, triple, context, quoted)
+        self._insert([tuple(self._add_term(node) for node in triple)])
+
+    def addN(self, quads):
+        self._insert([(self._add_term(s), self._add_term(p),
+                       self._add_term(o)) for s, p, o, c in quads])
+
+    def remove(self, triple_pattern, context=None):
+        where, parameters = self._get_where(triple_pattern)
+        if where is None:
+            return
+        self.connection.execute("DELETE FROM triple" + where, parameters)
+        if not where:
+            # No term is referenced anymore, e.g. when a reused store file
+            # is rebuilt from scratch
+            self.connection.execute("DELETE FROM term")
+            self._term_ids.clear()
+            self._get_term.cache_clear()
+        self._count_pending(1)
+
+    def triples(self, triple_pattern, context=None):
+        where, parameters = self._get_where(triple_pattern)
+        if where is None:
+            return
+        select = "SELECT DISTINCT" if self.is_bulk_loading else "SELECT"
+        get_term = self._get_term
+        for s, p, o in self.connection.execute(
+                select + " s, p, o FROM triple" + where, parameters):
+            yield (get_term(s), get_term(p), get_term(o)), iter(())
+
+    def __len__(self, context=None):
+        if self.is_bulk_loading:
+            query = "SELECT COUNT(*) FROM " \
+                    "(SELECT DISTINCT s, p, o FROM triple)"
+        else:
+            query = "SELECT COUNT(*) FROM triple"
+        return self.connection.execute(query).fetchone()[0]
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix, namespace):
+        namespace = URIRef(namespace)
+        self._namespaces[prefix] = namespace
+        self._prefixes[namespace] = prefix
+        if not self.read_only:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO namespace (prefix, namespace) "
+                "VALUES (?, ?)", (prefix, str(namespace)))
+
+    def namespace(self, prefix):
+        return self._namespaces.get(prefix)
+
+    def prefix(self, namespace):
+        return self._prefixes.get(URIRef(namespace))
+
+    def namespaces(self):
+        yield from self._namespaces.items()
+
+    def _insert(self, triples):
+        if self.is_bulk_loading:
+            statement = "INSERT INTO triple (s, p, o) VALUES (?, ?, ?)"
+        else:
+            statement = "INSERT OR IGNORE INTO triple (s, p, o) " \
+                        "VALUES (?, ?, ?)"
+        self.connection.executemany(statement, triples)
+        self._count_pending(len(triples))
+
+    def _count_pending(self, count):
+        self._pending += count
+        if self._pending >= self.batch_size:
+            self.commit()
+
+    def _add_term(self, node):
+        term_id = self._get_term_id(node)
+        if term_id is None:
+            term_id = self.connection.execute(
+                "INSERT INTO term (kind, value, datatype, language) "
+                "VALUES (?, ?, ?, ?)", _encode(node)).lastrowid
+            self._cache_term_id(node, term_id)
+        return term_id
+
+    def _get_term_id(self, node):
+        """Returns the ID of the stored term, or None if it is not stored"""
+        term_id = self._term_ids.get(node)
+        if term_id is None:
+            row = self.connection.execute(
+                "SELECT id FROM term WHERE kind = ? AND value = ? "
+                "AND datatype = ? AND language = ?",
+                _encode(node)).fetchone()
+            if row is not None:
+                term_id = row[0]
+                self._cache_term_id(node, term_id)
+        return term_id
+
+    def _cache_term_id(self, node, term_id):
+        if len(self._term_ids) >= self.cache_size:
+            self._term_ids.clear()
+        self._term_ids[node] = term_id
+
+    def _find_term(self, term_id):
+        kind, value, datatype, language = self.connection.execute(
+            "SELECT kind, value, datatype, language FROM term WHERE id = ?",
+            (term_id,)).fetchone()
+        return _decode(kind, value, datatype, language)
+
+    def _get_where(self, triple_pattern):
+        """Returns the WHERE clause and parameters selecting the triples of
+           the pattern, or None if a term of the pattern is not stored
+        """
+        conditions = []
+        parameters = []
+        for column, node in zip("spo", triple_pattern):
+            if node is None:
+                continue
+            term_id = self._get_term_id(node)
+            if term_id is None:
+                return None, None
+            conditions.append(f"{column} = ?")
+            parameters.append(term_id)
+        if not conditions:
+            return "", parameters
+        return " WHERE " + " AND ".join(conditions), parameters
+
+    def _create_tables(self):
+        with self.connection:
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS term ("
+                "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, "
+                "value TEXT NOT NULL, datatype TEXT NOT NULL, "
+                "language TEXT NOT NULL)")
+            self.connection.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS term_value "
+                "ON term (kind, value, datatype, language)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS triple ("
+                "s INTEGER NOT NULL, p INTEGER NOT NULL, o INTEGER NOT NULL)")
+            for statement in _INDEXES:
+                self.connection.execute(statement)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS namespace ("
+                "prefix TEXT PRIMARY KEY, namespace TEXT NOT NULL)")
+
+
+def _encode(node):
+    if isinstance(node, Literal):
+        return (_LITERAL, str(node), str(node.datatype or ''),
+                node.language or '')
+    if isinstance(node, BNode):
+        return (_BNODE, str(node), '', '')
+    return (_URI, str(node), '', '')
+
+
+def _decode(kind, value, datatype, language):
+    if kind == _LITERAL:
+        return Literal(value, lang=language or None,
+                       datatype=URIRef(datatype) if datatype else None)
+    if kind == _BNODE:
+        return BNode(value)
+    return URIRef(value)
@@ -0,0 +1,87 @@
+"""Generator of synthetic ASCT+B table rows, used by the benchmarks"""
+import random
+import zlib
+
+
+def generate_rows(size, as_depth=3, ct_depth=2, biomarkers_per_row=4,
+                  provisional_ratio=0.1, doi_count=1, branching=8,
+                  marker_pool_size=2000, doi_pool_size=500, seed=0):
+    """Yields synthetic rows shaped like the ASCT+B Reporter API data.
+
+    The anatomical structures of a row form a path of `as_depth` terms
+    below the kidney, and the cell types a path of `ct_depth` terms. Every
+    term has `branching` children, so the rows share their upper terms like
+    the real tables do. The biomarkers are picked from a pool of
+    `marker_pool_size` genes and proteins, and a cell type always comes
+    with the same markers. The rows are the same for the same seed.
+
+    Args:
+        size (int): The number of rows
+        as_depth (int): The number of anatomical structures per row, below
+            the organ
+        ct_depth (int): The number of cell types per row
+        biomarkers_per_row (int): The number of biomarkers per row
+        provisional_ratio (float): The ratio of the terms without an ID,
+            which are given provisional IDs
+        doi_count (int): The number of DOI references per row
+        branching (int): The number of child terms of every term
+        marker_pool_size (int): The number of distinct biomarkers
+        doi_pool_size (int): The number of distinct DOI references
+        seed (int): The seed of the random generator
+    """
+    rng = random.Random(seed)
+    for _ in range(size):
+        as_index = rng.randrange(branching ** as_depth)
+        ct_index = rng.randrange(branching ** ct_depth)
+        references = [
+            {'id': "", 'notes': "",
+             'doi': f"DOI: 10.5555/synthetic.{rng.randrange(doi_pool_size)}"}
+            for _ in range(doi_count)]
+        markers = _get_markers(ct_depth, ct_index, biomarkers_per_row,
+                               provisional_ratio, marker_pool_size)
+        yield {
+            'anatomical_structures':
+                [_get_term("kidney", "UBERON:0002113", 0)] +
+                _get_path("structure", "UBERON", as_depth, as_index,
+                          branching, provisional_ratio),
+            'cell_types':
+                _get_path("cell", "CL", ct_depth, ct_index,
+                          branching, provisional_ratio),
+            'biomarkers': markers,
+            'biomarkers_gene': [marker for marker in markers
+                                if marker['b_type'] == 'gene'],
+            'biomarkers_protein': [marker for marker in markers
+                                   if marker['b_type'] == 'protein'],
+            'references': references
+        }
+
+
+def _get_path(kind, prefix, depth, leaf_index, branching, provisional_ratio):
+    # The ancestors of the leaf term at each level, from the top
+    path = []
+    for level in range(depth, 0, -1):
+        index = leaf_index // branching ** (depth - level)
+        name = f"{kind} {level}.{index}"
+        term_id = f"{prefix}:{level}{index:07d}"
+        path.insert(0, _get_term(name, term_id, provisional_ratio))
+    return path
+
+
+def _get_markers(ct_depth, ct_index, biomarkers_per_row, provisional_ratio,
+                 marker_pool_size):
+    rng = random.Random(f"{ct_depth}.{ct_index}")
+    markers = []
+    for position, index in enumerate(
+            rng.sample(range(1, marker_pool_size + 1),
+                       min(biomarkers_per_row, marker_pool_size))):
+        marker = _get_term(f"GENE{index}", f"HGNC:{index}", provisional_ratio)
+        marker['b_type'] = 'gene' if position % 2 == 0 else 'protein'
+        markers.append(marker)
+    return markers
+
+
+def _get_term(name, term_id, provisional_ratio):
+    # A term is always provisional or never, whatever row it is in
+    if zlib.crc32(name.encode('utf-8')) % 10000 < provisional_ratio * 10000:
+        term_id = ""
+    return {'name': name, 'rdfs_label': "", 'id': term_id}
@@ -2,18 +2,42 @@
 import requests
 
 
-def request_get(url):
+# (connect, read) timeouts in seconds. The reporter service converts the
+# whole sheet before answering, so the read timeout is generous.
+DEFAULT_TIMEOUT = (10, 300)
+
+_session = None
+
+
+def get_session():
+    """
+    Returns the HTTP session shared by all the requests of this process so
+    that the connections to the same host are kept alive and reused.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def request_get(url, session=None, timeout=DEFAULT_TIMEOUT):
     """
     Performs a get request that provides a (somewhat) useful error message.
+    Raises requests.HTTPError when the server answers with an error status.
     """
+    if session is None:
+        session = get_session()
     try:
-        response = requests.get(url)
+        response = session.get(url, timeout=timeout)
     except ImportError:
         raise ImportError("Couldn't retrieve the data, check your URL")
     else:
+        response.raise_for_status()
         return response
 
 
-def json_handler(url):
-    """Returns request in JSON (dict) format"""
-    return request_get(url).json()
+def json_handler(url, session=None, timeout=DEFAULT_TIMEOUT):
+    """Returns request in JSON (dict) format. Raises a ValueError when the
+       response is not valid JSON.
+    """
+    return request_get(url, session, timeout).json()
@@ -0,0 +1,140 @@
+"""Validation of the ASCT+B table rows before the conversion"""
+import csv
+import json
+import re
+from collections import namedtuple
+
+from asctb2ccf.curie import CATEGORIES, is_doi_reference, is_well_formed_doi
+
+
+ERROR = 'error'  # the row cannot be converted
+WARNING = 'warning'  # the row is converted, but some data are ignored
+
+# A problem found in a row. The column is named like in the ASCT+B table,
+# e.g. AS/2/ID, after the position of the term in the row.
+Problem = namedtuple('Problem',
+                     ['row', 'column', 'value', 'problem', 'severity'])
+
+_COLUMNS = {
+    'anatomical_structures': 'AS',
+    'cell_types': 'CT',
+    'biomarkers_gene': 'BGene',
+    'biomarkers_protein': 'BProtein',
+    'biomarkers_lipids': 'BLipid',
+    'biomarkers_metabolites': 'BMetabolites',
+    'biomarkers_proteoforms': 'BProteoform'
+}
+
+# Category -> pattern of the IDs with an allowed prefix
+_ID_PATTERNS = {
+    category: re.compile(
+        r"^\s*(?:" + "|".join(re.escape(prefix) for prefix in prefixes)
+        + r"):", re.IGNORECASE)
+    for category, (_, prefixes) in CATEGORIES.items()}
+_HGNC_ID_PATTERN = re.compile(r"HGNC:[0-9]+")
+
+
+def validate_rows(rows, cell_biomarkers_only=False):
+    """Checks the IDs, labels and DOIs of all the rows in a single pass.
+       Returns the list of problems found.
+    """
+    problems = []
+    for index, row in enumerate(rows):
+        problems.extend(validate_row(index, row, cell_biomarkers_only))
+    return problems
+
+
+def validate_row(index, row, cell_biomarkers_only=False):
+    """Returns the problems of the row. A row with an error would raise a
+       ValueError in the conversion, for the given mode.
+    """
+    problems = []
+    if cell_biomarkers_only:
+        _check_last_term(problems, index, row, 'anatomical_structures',
+                         'AS', "Anatomical structure data are missing")
+        _check_last_term(problems, index, row, 'cell_types',
+                         'CT', "Cell type data are missing")
+        if not row['biomarkers']:
+            problems.append(Problem(index, "BGene", "",
+                                    "Biomarker data are missing", ERROR))
+    else:
+        for key, category in [('anatomical_structures', 'AS'),
+                              ('cell_types', 'CT')]:
+            for position, term in enumerate(row[key]):
+                if term['name'] or term['rdfs_label']:
+                    _check_id(problems, index, _get_column(key, position),
+                              term['id'], category)
+
+    for key in _COLUMNS:
+        for position, term in enumerate(row.get(key, [])):
+            column = _get_column(key, position)
+            if term['id'] and not (term['name'] or term['rdfs_label']):
+                problems.append(Problem(
+                    index, column, term['id'],
+                    "Missing label, the term is ignored", WARNING))
+            if key.startswith('biomarkers') and term['id']\
+                    and not _HGNC_ID_PATTERN.match(term['id']):
+                problems.append(Problem(
+                    index, column, term['id'],
+                    "Not an HGNC ID, a provisional ID is used", WARNING))
+
+    for position, reference in enumerate(row['references']):
+        doi = reference.get('doi')
+        if not doi:
+            continue
+        # The same checks as the conversion of the references
+        if not is_doi_reference(doi):
+            problems.append(Problem(
+                index, f"REF/{position + 1}/DOI", doi,
+                "Missing doi: or DOI: prefix, the reference is ignored",
+                WARNING))
+        elif not is_well_formed_doi(doi):
+            problems.append(Problem(
+                index, f"REF/{position + 1}/DOI", doi,
+                "Malformed DOI, the reference is converted as is", WARNING))
+    return problems
+
+
+def get_invalid_rows(problems):
+    """Returns the indexes of the rows with an error"""
+    return {problem.row for problem in problems if problem.severity == ERROR}
+
+
+def write_report(problems, destination):
+    """Writes the problems to a CSV file if the destination name ends with
+       .csv, and to a JSON file otherwise
+    """
+    with open(destination, 'w', newline='') as f:
+        if destination.lower().endswith('.csv'):
+            writer = csv.writer(f)
+            writer.writerow(Problem._fields)
+            writer.writerows(problems)
+        else:
+            json.dump([problem._asdict() for problem in problems], f,
+                      indent=2)
+
+
+def _check_id(problems, index, column, term_id, category):
+    # Terms without an ID, or without a prefix, are given provisional IDs
+    if term_id and ":" in term_id\
+            and not _ID_PATTERNS[category].match(term_id):
+        name, _ = CATEGORIES[category]
+        problems.append(Problem(index, column, term_id,
+                                f"Invalid {name} ID: {term_id}", ERROR))
+
+
+def _check_last_term(problems, index, row, key, category, missing_message):
+    terms = row[key]
+    positions = [position for position, term in enumerate(terms)
+                 if term and 'id' in term]
+    if not positions:
+        problems.append(Problem(index, _COLUMNS[key] + "/1", "",
+                                missing_message, ERROR))
+        return
+    position = positions[-1]
+    _check_id(problems, index, _get_column(key, position),
+              terms[position]['id'], category)
+
+
+def _get_column(key, position):
+    return f"{_COLUMNS[key]}/{position + 1}/ID"
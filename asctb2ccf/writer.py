@@ -0,0 +1,52 @@
+"""Streaming N-Triples writer"""
+import hashlib
+
+from rdflib.plugins.serializers.nt import _nt_row
+
+from asctb2ccf.formats import open_output
+
+
+class NTriplesWriter:
+    """Writes triples to an N-Triples file as soon as they are added.
+
+    The writer never keeps the triples in memory. Instead, it remembers a
+    64-bit hash of every line written so far to skip the duplicates, which
+    keeps the memory use small even for very large ontologies. The file
+    is compressed on the fly when a compression (gzip or zstd) is given or
+    implied by its extension.
+    """
+    def __init__(self, destination, compression=None):
+        self.destination = destination
+        self.stream = open_output(destination, compression)
+        self.seen = set()
+
+    def add(self, triple):
+        """Writes the triple unless it has been written before.
+           Returns True if the triple is new.
+        """
+        line = _nt_row(triple).encode('ascii', '_rdflib_nt_escape')
+        key = int.from_bytes(
+            hashlib.blake2b(line, digest_size=8).digest(), 'big')
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.stream.write(line)
+        return True
+
+    def write_graph(self, graph):
+        """Writes all the triples of the graph. Returns the number of new
+           triples written.
+        """
+        return sum(1 for triple in graph if self.add(triple))
+
+    def close(self):
+        self.stream.close()
+
+    def __len__(self):
+        return len(self.seen)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
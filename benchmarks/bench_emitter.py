@@ -0,0 +1,46 @@
+"""Compares the TripleEmitter with the infixowl-based emitter.
+
+Usage: python benchmarks/bench_emitter.py [number of rows]
+"""
+import sys
+import time
+
+from rdflib.compare import isomorphic
+
+from asctb2ccf.emitter import TripleEmitter, InfixOwlEmitter
+from asctb2ccf.ontology import BSOntology
+from asctb2ccf.synthetic import generate_rows
+
+
+def build(emitter_class, rows):
+    o = BSOntology.new("Kidney", "http://purl.org/ccf/data/bench.owl")
+    o = BSOntology(o.graph, emitter_class(o.graph))
+    for row in rows:
+        o = o.mutate_anatomical_structure(row)
+        o = o.mutate_cell_type(row)
+        o = o.mutate_biomarker(row)
+        o = o.mutate_partonomy(row)
+        o = o.mutate_cell_hierarchy(row)
+        o = o.mutate_cell_location(row)
+        o = o.mutate_cell_biomarker(row)
+    return o.graph
+
+
+def main(size):
+    rows = list(generate_rows(size))
+    assert isomorphic(build(TripleEmitter, rows[:20]),
+                      build(InfixOwlEmitter, rows[:20]))
+
+    timings = {}
+    for emitter_class in [InfixOwlEmitter, TripleEmitter]:
+        start = time.perf_counter()
+        graph = build(emitter_class, rows)
+        timings[emitter_class] = time.perf_counter() - start
+        print(f"{emitter_class.__name__:>16}: {timings[emitter_class]:.2f}s "
+              f"for {size} rows ({len(graph)} triples)")
+    speedup = timings[InfixOwlEmitter] / timings[TripleEmitter]
+    print(f"Speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
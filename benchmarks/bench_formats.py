@@ -0,0 +1,69 @@
+"""Compares the serialization time and file size of the output formats.
+
+The ontology is built once from a synthetic table and then written in
+every format, uncompressed and compressed. The formats and compressions
+whose optional package is not installed are skipped.
+
+Usage: python benchmarks/bench_formats.py [number of rows] [-o report.json]
+"""
+import json
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from asctb2ccf.formats import FORMATS, COMPRESSIONS
+from asctb2ccf.ontology import BSOntology
+from asctb2ccf.registry import ProvisionalIdRegistry
+from asctb2ccf.synthetic import generate_rows
+
+
+def build(size):
+    o = BSOntology.new("Kidney", "http://purl.org/ccf/data/bench.owl",
+                       registry=ProvisionalIdRegistry())
+    for row in generate_rows(size):
+        o = o.apply_row(row)
+        o = o.mutate_cell_biomarker(row)
+    return o
+
+
+def main(size, output):
+    o = build(size)
+    print(f"{size} rows ({len(o.graph)} triples)")
+
+    report = []
+    with tempfile.TemporaryDirectory() as directory:
+        for format in FORMATS:
+            for compression in [None] + list(COMPRESSIONS):
+                destination = os.path.join(
+                    directory, f"bench.{format}" +
+                    (COMPRESSIONS[compression] if compression else ""))
+                start = time.perf_counter()
+                try:
+                    o.serialize(destination, format, compression)
+                except ImportError as e:
+                    print(f"  {format:>9} {compression or '':>5}: skipped, "
+                          f"{e}")
+                    continue
+                seconds = time.perf_counter() - start
+                size_in_bytes = os.path.getsize(destination)
+                report.append({'format': format,
+                               'compression': compression,
+                               'seconds': seconds,
+                               'bytes': size_in_bytes})
+                print(f"  {format:>9} {compression or '':>5}: "
+                      f"{seconds:7.2f}s {size_in_bytes / 2 ** 20:9.2f} MiB")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump({'rows': size, 'triples': len(o.graph),
+                       'formats': report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("size", type=int, nargs='?', default=10000,
+                        help="Number of rows")
+    parser.add_argument("-o", "--output", help="JSON report file")
+    args = parser.parse_args()
+    main(args.size, args.output)
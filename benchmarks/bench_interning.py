@@ -0,0 +1,63 @@
+"""Compares the node allocations with and without the term interning.
+
+The same synthetic table is converted with the TermInterner, which builds
+every distinct IRI and literal once, and with a pass-through interner that
+builds a new node for every request, like before the interning. The nodes
+requested and allocated, the conversion time and the peak memory traced
+during the conversion are reported.
+
+Usage: python benchmarks/bench_interning.py [number of rows]
+"""
+import sys
+import time
+import tracemalloc
+
+from rdflib import URIRef, Literal
+
+from asctb2ccf.interning import TermInterner
+from asctb2ccf.ontology import BSOntology
+from asctb2ccf.registry import ProvisionalIdRegistry
+from asctb2ccf.synthetic import generate_rows
+
+
+class PassThroughInterner(TermInterner):
+    def iri(self, value):
+        self.requests += 1
+        return URIRef(value)
+
+    def literal(self, value, datatype=None):
+        self.requests += 1
+        return Literal(value, datatype=datatype)
+
+    @property
+    def allocations(self):
+        return self.requests
+
+
+def build(interner, rows):
+    o = BSOntology.new("Kidney", "http://purl.org/ccf/data/bench.owl",
+                       registry=ProvisionalIdRegistry())
+    o = BSOntology(o.graph, registry=o.registry, interner=interner)
+    for row in rows:
+        o = o.apply_row(row)
+        o = o.mutate_cell_biomarker(row)
+    return o.graph
+
+
+def main(size):
+    rows = list(generate_rows(size))
+    for interner in [PassThroughInterner(), TermInterner()]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        graph = build(interner, rows)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{type(interner).__name__:>19}: {interner.requests} nodes "
+              f"requested, {interner.allocations} allocated, "
+              f"{seconds:.2f}s, peak {peak / 2 ** 20:.1f} MiB "
+              f"for {size} rows ({len(graph)} triples)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
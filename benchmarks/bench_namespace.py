@@ -0,0 +1,39 @@
+"""Measures the cost of accessing the terms of the namespace classes.
+
+The defined terms are precomputed URIRef class attributes. The previous
+lookup, which checked the membership of the term against the annotations
+of every class in the MRO and built a new URIRef on every access, is
+reproduced here for comparison.
+
+Usage: python benchmarks/bench_namespace.py [number of accesses]
+"""
+import sys
+import timeit
+
+from asctb2ccf.namespace import CCF, DefinedNamespace
+
+
+def legacy_getattr(cls, name):
+    if not any(name in c.__annotations__ or name in c._extras
+               for c in cls.mro() if issubclass(c, DefinedNamespace)):
+        raise AttributeError(f"term '{name}' not in namespace '{cls._NS}'")
+    return cls._NS[name]
+
+
+def main(number):
+    timings = {
+        'per-access lookup': timeit.timeit(
+            lambda: legacy_getattr(CCF, 'ccf_pref_label'), number=number),
+        'term table lookup': timeit.timeit(
+            lambda: CCF['ccf_pref_label'], number=number),
+        'attribute access': timeit.timeit(
+            lambda: CCF.ccf_pref_label, number=number)
+    }
+    for name, seconds in timings.items():
+        print(f"{name:>17}: {seconds / number * 1e9:7.1f} ns per access")
+    speedup = timings['per-access lookup'] / timings['attribute access']
+    print(f"Speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
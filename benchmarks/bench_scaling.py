@@ -0,0 +1,168 @@
+"""Measures how the conversion scales with the size of the ASCT+B table.
+
+Every stage (BSOntology.new, each mutate_* method over all the rows,
+mutate_cell_biomarker and serialize) is timed on synthetic tables of
+growing size. The peak memory of each size is measured in a second pass
+with tracemalloc, which would otherwise slow down the timings. A stage
+is flagged when its time grows faster than the number of rows. No network
+access is needed.
+
+Usage: python benchmarks/bench_scaling.py [--sizes 1000 10000 ...]
+"""
+import json
+import math
+import os
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+from asctb2ccf.ontology import BSOntology
+from asctb2ccf.registry import ProvisionalIdRegistry
+from asctb2ccf.synthetic import generate_rows
+
+
+MUTATE_METHODS = [
+    'mutate_anatomical_structure',
+    'mutate_cell_type',
+    'mutate_biomarker',
+    'mutate_partonomy',
+    'mutate_cell_hierarchy',
+    'mutate_cell_location'
+]
+
+# The stages faster than this are too noisy to compare
+MIN_SECONDS = 0.05
+
+
+def run_stages(rows, destination):
+    """Runs every stage on the rows. Returns a list of
+       (stage, seconds, triples added) tuples.
+    """
+    results = []
+
+    def timed(stage, function):
+        size = len(o.graph) if o is not None else 0
+        start = time.perf_counter()
+        value = function()
+        elapsed = time.perf_counter() - start
+        graph = value.graph if isinstance(value, BSOntology) else o.graph
+        results.append((stage, elapsed, len(graph) - size))
+        return value
+
+    o = None
+    o = timed('new', lambda: BSOntology.new(
+        "Kidney", "http://purl.org/ccf/data/bench.owl",
+        registry=ProvisionalIdRegistry()))
+    for method in MUTATE_METHODS:
+        o = timed(method, lambda: _apply(o, method, rows))
+    timed('serialize', lambda: o.serialize(destination))
+
+    o = BSOntology.new("Kidney", "http://purl.org/ccf/data/bench.owl",
+                       registry=ProvisionalIdRegistry())
+    timed('mutate_cell_biomarker',
+          lambda: _apply(o, 'mutate_cell_biomarker', rows))
+    return results
+
+
+def _apply(o, method, rows):
+    for row in rows:
+        try:
+            o = getattr(o, method)(row)
+        except ValueError:
+            pass
+    return o
+
+
+def measure_peak_memory(rows, destination):
+    tracemalloc.start()
+    try:
+        run_stages(rows, destination)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def get_scaling_exponents(report):
+    """Returns the stage -> growth exponent of the time between each pair
+       of consecutive sizes, 1.0 being linear
+    """
+    exponents = {}
+    for smaller, larger in zip(report, report[1:]):
+        size_ratio = larger['size'] / smaller['size']
+        for stage, timing in larger['stages'].items():
+            previous = smaller['stages'][stage]['seconds']
+            if previous >= MIN_SECONDS and timing['seconds'] > 0:
+                exponents.setdefault(stage, []).append(
+                    math.log(timing['seconds'] / previous) /
+                    math.log(size_ratio))
+    return exponents
+
+
+def main(sizes, threshold, measure_memory, output, generator_options):
+    report = []
+    with tempfile.TemporaryDirectory() as directory:
+        destination = os.path.join(directory, "bench.owl")
+        for size in sizes:
+            rows = list(generate_rows(size, **generator_options))
+            stages = {}
+            for stage, seconds, triples in run_stages(rows, destination):
+                stages[stage] = {
+                    'seconds': seconds,
+                    'triples': triples,
+                    'rows_per_second': size / seconds if seconds else 0,
+                    'triples_per_second': triples / seconds if seconds else 0
+                }
+            entry = {'size': size, 'stages': stages}
+            if measure_memory:
+                entry['peak_memory'] = measure_peak_memory(rows, destination)
+            report.append(entry)
+
+            print(f"{size} rows" + (
+                f", peak memory {entry['peak_memory'] / 2 ** 20:.1f} MiB"
+                if measure_memory else ""))
+            for stage, timing in stages.items():
+                print(f"  {stage:>28}: {timing['seconds']:9.3f}s "
+                      f"{timing['triples']:>10} triples "
+                      f"{timing['triples_per_second']:>12.0f} triples/s")
+
+    exponents = get_scaling_exponents(report)
+    super_linear = {stage: values for stage, values in exponents.items()
+                    if max(values) > threshold}
+    for stage, values in exponents.items():
+        flag = "  SUPER-LINEAR" if stage in super_linear else ""
+        print(f"{stage:>30}: growth exponents " +
+              ", ".join(f"{value:.2f}" for value in values) + flag)
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump({'sizes': report, 'exponents': exponents,
+                       'super_linear': sorted(super_linear)}, f, indent=2)
+    return super_linear
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs='+',
+                        default=[1000, 10000, 100000],
+                        help="Numbers of rows, e.g. 1000 10000 100000 1000000")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Growth exponent above which a stage is flagged")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the peak memory pass")
+    parser.add_argument("--as-depth", type=int, default=3)
+    parser.add_argument("--ct-depth", type=int, default=2)
+    parser.add_argument("--biomarkers-per-row", type=int, default=4)
+    parser.add_argument("--provisional-ratio", type=float, default=0.1)
+    parser.add_argument("--doi-count", type=int, default=1)
+    parser.add_argument("-o", "--output", help="JSON report file")
+    args = parser.parse_args()
+
+    super_linear = main(args.sizes, args.threshold, not args.no_memory,
+                        args.output,
+                        {'as_depth': args.as_depth,
+                         'ct_depth': args.ct_depth,
+                         'biomarkers_per_row': args.biomarkers_per_row,
+                         'provisional_ratio': args.provisional_ratio,
+                         'doi_count': args.doi_count})
+    raise SystemExit(1 if super_linear else 0)
@@ -11,8 +11,6 @@ License :: OSI Approved :: BSD License
 Intended Audience :: Science/Research
 Topic :: Scientific/Engineering
 Topic :: Scientific/Engineering :: Bio-Informatics
-Programming Language :: Python :: 3.5
-Programming Language :: Python :: 3.6
 Programming Language :: Python :: 3.7
 Programming Language :: Python :: 3.8
 Operating System :: POSIX :: Linux
@@ -27,12 +25,15 @@ setup(name='asctb2ccf',
       license='BSD',
       classifiers=classifiers,
       install_requires=[
-          'rdflib==5.0.0',
-          'stringcase==1.2.0'
+          'rdflib==5.0.0'
       ],
-      python_requires='>=3.5',
+      extras_require={
+          'jsonld': ['rdflib-jsonld==0.5.0'],
+          'zstd': ['zstandard>=0.15']
+      },
+      python_requires='>=3.7',
       test_suite='nose.collector',
       tests_require=['nose'],
       packages=find_packages(),
       include_package_data=True,
-      scripts=['bin/asctb2ccf'])
+      scripts=['bin/asctb2ccf', 'bin/asctb2ccf-merge'])
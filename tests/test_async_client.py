@@ -0,0 +1,108 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+from asctb2ccf.async_client import AsyncAsctbReporterClient
+from asctb2ccf.client import AsctbReporterClient
+
+
+def gsheet_url(sheet_id):
+    return f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit#gid=0"
+
+
+class ReporterHandler(BaseHTTPRequestHandler):
+    """Stand-in of the ASCT+B Reporter API. The sheet ID tells how many
+       seconds the conversion takes, e.g. 'sheet-0.2' or 'sheet-0.2-b'.
+    """
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        sheet_id = urlparse(query['csvUrl'][0]).path.split('/')[3]
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight,
+                                       server.in_flight)
+        try:
+            time.sleep(float(sheet_id.split('-')[1]))
+            body = json.dumps({'data': [{'sheet': sheet_id}]})
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(body.encode('utf-8'))
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AsyncAsctbReporterClientTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ReporterHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        host, port = self.server.server_address
+        self.base_url = f"http://{host}:{port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _fetch_all(self, gsheet_urls, **kwargs):
+        # No proxy settings from the environment for the local server
+        session = requests.Session()
+        session.trust_env = False
+        client = AsyncAsctbReporterClient(
+            AsctbReporterClient(session=session, base_url=self.base_url),
+            **kwargs)
+
+        async def fetch_all():
+            return [result async for result in
+                    client.iter_data_by_gsheet_urls(gsheet_urls)]
+        try:
+            return asyncio.run(fetch_all())
+        finally:
+            client.close()
+
+    def test_max_concurrency(self):
+        urls = [gsheet_url(f"sheet-0.2-{i}") for i in range(6)]
+        results = self._fetch_all(urls, max_concurrency=2, max_per_host=4)
+        self.assertEqual(sorted(urls), sorted(url for url, _, _ in results))
+        self.assertTrue(all(error is None for _, _, error in results))
+        self.assertEqual(2, self.server.max_in_flight)
+
+    def test_max_per_host(self):
+        urls = [gsheet_url(f"sheet-0.2-{i}") for i in range(6)]
+        self._fetch_all(urls, max_concurrency=8, max_per_host=3)
+        self.assertEqual(3, self.server.max_in_flight)
+
+    def test_timeout_is_reported_as_failure(self):
+        slow_url, fast_url = gsheet_url("sheet-2"), gsheet_url("sheet-0")
+        results = dict((url, (response, error)) for url, response, error
+                       in self._fetch_all([slow_url, fast_url], timeout=0.5))
+        response, error = results[slow_url]
+        self.assertIsNone(response)
+        self.assertIsInstance(error, asyncio.TimeoutError)
+        self.assertEqual(({'data': [{'sheet': "sheet-0"}]}, None),
+                         results[fast_url])
+
+    def test_yields_as_completed(self):
+        urls = [gsheet_url("sheet-0.6"), gsheet_url("sheet-0.3"),
+                gsheet_url("sheet-0")]
+        results = self._fetch_all(urls)
+        self.assertEqual(urls[::-1], [url for url, _, _ in results])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from argparse import Namespace
+from unittest import mock
+
+import asctb2ccf.batch
+from asctb2ccf.batch import Checkpoint, get_fingerprint
+
+from tests.utils import make_args
+
+
+TABLE = """Kidney,,,,,,,,
+AS/1,AS/1/LABEL,AS/1/ID,CT/1,CT/1/LABEL,CT/1/ID,BGene/1,BGene/1/LABEL,BGene/1/ID
+kidney,kidney,UBERON:0002113,podocyte,podocyte,CL:0000653,NPHS1,NPHS1,HGNC:7908
+"""
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.input_csv = self._path("kidney.csv")
+        with open(self.input_csv, 'w') as f:
+            f.write(TABLE)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _write_manifest(self, entries):
+        path = self._path("organs.json")
+        with open(path, 'w') as f:
+            json.dump(entries, f)
+        return path
+
+    def _entry(self, name, input_csv=None):
+        return {'organ_name': "Kidney",
+                'input_csv': input_csv or self.input_csv,
+                'ontology_iri': "http://purl.org/ccf/data/test.owl",
+                'output': self._path(name)}
+
+    def test_fingerprint_covers_settings_and_table(self):
+        organ_args = make_args(output="kidney.nt", format='nt')
+        fingerprint = get_fingerprint(organ_args, TABLE.encode('utf-8'))
+        self.assertEqual(
+            fingerprint, get_fingerprint(make_args(output="kidney.nt",
+                                                   format='nt'),
+                                         TABLE.encode('utf-8')))
+        for key, value in [('format', 'nt-sorted'), ('compress', 'gzip'),
+                           ('cell_location', 'leaf'), ('closure', True),
+                           ('index', True), ('streaming', True),
+                           ('store', True), ('cell_biomarkers_only', True)]:
+            with self.subTest(key=key):
+                changed_args = make_args(output="kidney.nt", format='nt')
+                setattr(changed_args, key, value)
+                self.assertNotEqual(
+                    fingerprint,
+                    get_fingerprint(changed_args, TABLE.encode('utf-8')))
+        self.assertNotEqual(
+            fingerprint,
+            get_fingerprint(organ_args, TABLE.replace("NPHS1", "NPHS2")
+                            .encode('utf-8')))
+
+    def test_entry_defaults_to_the_cell_biomarkers_only_flag(self):
+        args = make_args(cell_biomarkers_only=True)
+        entry = self._entry("kidney.nt")
+        self.assertTrue(
+            asctb2ccf.batch._make_args(args, entry).cell_biomarkers_only)
+        entry['cell_biomarkers_only'] = False
+        self.assertFalse(
+            asctb2ccf.batch._make_args(args, entry).cell_biomarkers_only)
+
+    def test_original_arguments(self):
+        manifest = self._write_manifest([self._entry("kidney.owl")])
+        asctb2ccf.batch.run(Namespace(manifest=manifest,
+                                      cell_biomarkers_only=False))
+        self.assertTrue(os.path.exists(self._path("kidney.owl")))
+
+    def test_fetch_timeout_is_logged(self):
+        entry = self._entry("kidney.nt")
+        del entry['input_csv']
+        entry['gsheet_url'] = ("https://docs.google.com/spreadsheets/d/"
+                               "sheet/edit#gid=0")
+        args = make_args(manifest=self._write_manifest([entry]),
+                         fetch_timeout=0.1)
+
+        def get_data_by_gsheet_url(client, gsheet_url, format="json"):
+            time.sleep(1)
+        with mock.patch.object(asctb2ccf.batch.AsctbReporterClient,
+                               'get_data_by_gsheet_url',
+                               get_data_by_gsheet_url),\
+                self.assertLogs(level='ERROR') as logs,\
+                self.assertRaises(RuntimeError):
+            asctb2ccf.batch.run(args)
+        self.assertEqual(["ERROR:root:Failed to fetch Kidney: TimeoutError"],
+                         logs.output)
+
+    def test_checkpoint_resumes_a_failed_run_only(self):
+        manifest = self._write_manifest([
+            self._entry("kidney.nt"),
+            self._entry("missing.nt", self._path("missing.csv"))])
+        args = make_args(manifest=manifest, format='nt')
+        with self.assertRaises(RuntimeError):
+            asctb2ccf.batch.run(args)
+        checkpoint = Checkpoint(f"{manifest}.checkpoint")
+        self.assertEqual([self._path("kidney.nt")], list(checkpoint.done))
+
+        # The converted organ is skipped with the same settings, and
+        # converted again when an output setting changes
+        os.utime(self._path("kidney.nt"), (0, 0))
+        with self.assertRaises(RuntimeError):
+            asctb2ccf.batch.run(args)
+        self.assertEqual(0, os.path.getmtime(self._path("kidney.nt")))
+        args.format = 'nt-sorted'
+        with self.assertRaises(RuntimeError):
+            asctb2ccf.batch.run(args)
+        self.assertNotEqual(0, os.path.getmtime(self._path("kidney.nt")))
+
+        # The checkpoint is deleted once every organ is converted
+        self._write_manifest([self._entry("kidney.nt")])
+        asctb2ccf.batch.run(args)
+        self.assertFalse(os.path.exists(f"{manifest}.checkpoint"))
+
+
+if __name__ == '__main__':
+    unittest.main()
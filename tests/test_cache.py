@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from asctb2ccf import pipeline
+from asctb2ccf.cache import BuildCache
+from asctb2ccf.synthetic import generate_rows
+from tests.utils import make_args
+
+
+class BuildCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.rows = list(generate_rows(30))
+        self.output = os.path.join(self.directory.name, "kidney.nt")
+        self.cache_dir = os.path.join(self.directory.name, "cache")
+
+    def convert(self, **kwargs):
+        args = make_args(output=self.output, format='nt-sorted', **kwargs)
+        pipeline.run(args, rows=self.rows)
+        with open(self.output, 'rb') as f:
+            return f.read()
+
+    def test_fetch_copies_the_entry(self):
+        cache = BuildCache(self.cache_dir)
+        source = os.path.join(self.directory.name, "source")
+        with open(source, 'w') as f:
+            f.write("cached")
+        cache.put("key", source)
+        self.assertTrue(cache.fetch("key", self.output))
+        with open(self.output, 'w') as f:
+            f.write("overwritten")
+        destination = os.path.join(self.directory.name, "again")
+        self.assertTrue(cache.fetch("key", destination))
+        with open(destination) as f:
+            self.assertEqual(f.read(), "cached")
+        self.assertFalse(cache.fetch("other", destination))
+
+    def test_hit_then_miss_then_hit(self):
+        full = self.convert(build_cache=self.cache_dir, index=True)
+        with open(f"{self.output}.index.json", 'rb') as f:
+            full_index = f.read()
+        self.assertEqual(self.convert(build_cache=self.cache_dir,
+                                      index=True), full)
+
+        # A different mode, without the cache, writes the outputs of the
+        # previous hit again
+        leaf = self.convert(cell_location='leaf', cell_biomarkers_only=True,
+                            index=True)
+        self.assertNotEqual(leaf, full)
+
+        # So does a miss of the cache
+        self.assertEqual(self.convert(build_cache=self.cache_dir,
+                                      cell_location='leaf',
+                                      cell_biomarkers_only=True,
+                                      index=True), leaf)
+
+        self.assertEqual(self.convert(build_cache=self.cache_dir,
+                                      index=True), full)
+        with open(f"{self.output}.index.json", 'rb') as f:
+            self.assertEqual(f.read(), full_index)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+from asctb2ccf.client import AsctbReporterClient
+
+
+# The responses of the stand-in server by sheet ID: status and body
+RESPONSES = {
+    'ok': (200, b'{"data": []}'),
+    'error': (500, b'{"msg": "Failed to convert the sheet"}'),
+    'invalid': (200, b'<html>Service Unavailable</html>')
+}
+
+
+def gsheet_url(sheet_id):
+    return f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit#gid=0"
+
+
+class ReporterHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        sheet_id = urlparse(query['csvUrl'][0]).path.split('/')[3]
+        status, body = RESPONSES[sheet_id]
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AsctbReporterClientTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ReporterHandler)
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        host, port = self.server.server_address
+        self._directory = tempfile.TemporaryDirectory()
+        self.cache_dir = self._directory.name
+        # No proxy settings from the environment for the local server
+        session = requests.Session()
+        session.trust_env = False
+        self.client = AsctbReporterClient(cache_dir=self.cache_dir,
+                                          session=session,
+                                          base_url=f"http://{host}:{port}")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self._directory.cleanup()
+
+    def _cached_files(self):
+        return [name for _, _, names in os.walk(self.cache_dir)
+                for name in names]
+
+    def test_success_is_cached(self):
+        self.assertEqual({'data': []},
+                         self.client.get_data_by_gsheet_url(gsheet_url('ok')))
+        self.assertEqual(1, len(self._cached_files()))
+
+    def test_error_status_is_not_cached(self):
+        with self.assertRaises(requests.HTTPError):
+            self.client.get_data_by_gsheet_url(gsheet_url('error'))
+        self.assertEqual([], self._cached_files())
+
+    def test_invalid_json_is_not_cached(self):
+        with self.assertRaises(ValueError):
+            self.client.get_data_by_gsheet_url(gsheet_url('invalid'))
+        self.assertEqual([], self._cached_files())
+
+
+if __name__ == '__main__':
+    unittest.main()
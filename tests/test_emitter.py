@@ -0,0 +1,53 @@
+import copy
+import unittest
+
+from rdflib.compare import isomorphic
+
+from asctb2ccf.emitter import TripleEmitter, InfixOwlEmitter
+from asctb2ccf.ontology import BSOntology
+from asctb2ccf.synthetic import generate_rows
+
+
+def make_rows():
+    rows = list(generate_rows(20))
+    # The same marker set characterizing another cell type, the same row
+    # twice, and a row whose markers have no ID
+    repeated = copy.deepcopy(rows[0])
+    repeated['cell_types'] = copy.deepcopy(rows[1]['cell_types'])
+    unmarked = copy.deepcopy(rows[2])
+    for key in ['biomarkers', 'biomarkers_gene', 'biomarkers_protein']:
+        for marker in unmarked[key]:
+            marker['id'] = ""
+    return rows + [repeated, copy.deepcopy(rows[3]), unmarked]
+
+
+def build(emitter_class, rows, cell_biomarkers_only=False):
+    o = BSOntology.new("Kidney", "http://purl.org/ccf/data/test.owl")
+    o = BSOntology(o.graph, emitter_class(o.graph))
+    for row in rows:
+        if not cell_biomarkers_only:
+            o = o.mutate_anatomical_structure(row)
+            o = o.mutate_cell_type(row)
+            o = o.mutate_biomarker(row)
+            o = o.mutate_partonomy(row)
+            o = o.mutate_cell_hierarchy(row)
+            o = o.mutate_cell_location(row)
+        o = o.mutate_cell_biomarker(row)
+    return o.graph
+
+
+class EmitterTest(unittest.TestCase):
+    def test_same_graph_as_infixowl(self):
+        rows = make_rows()
+        self.assertTrue(isomorphic(build(TripleEmitter, rows),
+                                   build(InfixOwlEmitter, rows)))
+
+    def test_same_cell_biomarkers_as_infixowl(self):
+        rows = make_rows()
+        self.assertTrue(isomorphic(
+            build(TripleEmitter, rows, cell_biomarkers_only=True),
+            build(InfixOwlEmitter, rows, cell_biomarkers_only=True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import copy
+import os
+import tempfile
+import unittest
+
+from rdflib import Graph, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import OWL, RDF
+
+from asctb2ccf import pipeline
+from asctb2ccf.synthetic import generate_rows
+from tests.utils import make_args
+
+
+def load(path):
+    graph = Graph()
+    graph.parse(path, format='nt')
+    return graph
+
+
+class IncrementalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.output = os.path.join(self.directory.name, "kidney.nt")
+        self.full_output = os.path.join(self.directory.name, "full.nt")
+
+    def assertSameAsFullBuild(self, rows, **kwargs):
+        pipeline.run(make_args(output=self.output, format='nt',
+                               incremental=True, **kwargs), rows=rows)
+        pipeline.run(make_args(output=self.full_output, format='nt',
+                               **kwargs), rows=rows)
+        incremental = load(self.output)
+        self.assertTrue(isomorphic(incremental, load(self.full_output)))
+        return incremental
+
+    def test_rebuild_after_edits(self):
+        rows = list(generate_rows(40))
+        self.assertSameAsFullBuild(rows)
+
+        # Edit a row, delete rows, add new rows and a duplicate
+        rows = copy.deepcopy(rows)
+        rows[3]['cell_types'][-1]['name'] = "edited cell"
+        rows[3]['cell_types'][-1]['id'] = ""
+        del rows[10:15]
+        new_rows = list(generate_rows(50))[40:]
+        rows.extend(new_rows + [copy.deepcopy(rows[0])])
+        self.assertSameAsFullBuild(rows)
+
+        # Only one of the two identical rows is removed, then both
+        self.assertSameAsFullBuild(rows[:-1])
+        self.assertSameAsFullBuild(rows[1:-1])
+
+    def test_shared_triples_are_kept(self):
+        rows = list(generate_rows(20))
+        before = self.assertSameAsFullBuild(rows)
+        # The body and the organ are in every row, the seed triples in none
+        after = self.assertSameAsFullBuild(rows[:1])
+        self.assertLess(len(after), len(before))
+        self.assertSameAsFullBuild([])
+
+    def test_ontology_iri_change(self):
+        rows = list(generate_rows(20))
+        self.assertSameAsFullBuild(rows)
+        graph = self.assertSameAsFullBuild(
+            rows, ontology_iri="http://purl.org/ccf/data/other.owl")
+        self.assertEqual([URIRef("http://purl.org/ccf/data/other.owl")],
+                         list(graph.subjects(RDF.type, OWL.Ontology)))
+
+    def test_mode_change(self):
+        rows = list(generate_rows(20))
+        self.assertSameAsFullBuild(rows)
+        self.assertSameAsFullBuild(rows, cell_biomarkers_only=True)
+        self.assertSameAsFullBuild(rows, cell_location='leaf')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from asctb2ccf import pipeline
+from asctb2ccf.index import TermIndex
+from asctb2ccf.synthetic import generate_rows
+from tests.utils import make_args
+
+
+MARKER_IRI = "http://identifiers.org/hgnc/424242"
+
+
+def make_rows():
+    """Returns rows where the same marker is a gene in the first row and a
+       protein in the last one
+    """
+    rows = list(generate_rows(20))
+    for row, biomarker_type in [(rows[0], 'gene'), (rows[-1], 'protein')]:
+        marker = {'name': "MARKER", 'rdfs_label': "", 'id': "HGNC:424242",
+                  'b_type': biomarker_type}
+        row['biomarkers_' + biomarker_type].append(marker)
+        row['biomarkers'].append(marker)
+    return rows
+
+
+class TermIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.output = os.path.join(self.directory.name, "kidney.nt")
+
+    def convert(self, **kwargs):
+        args = make_args(output=self.output, format='nt', index=True,
+                         **kwargs)
+        pipeline.run(args, rows=make_rows())
+        return TermIndex.load(f"{self.output}.index.json")
+
+    def test_all_biomarker_types(self):
+        for shards in [1, 2]:
+            with self.subTest(shards=shards):
+                index = self.convert(shards=shards)
+                self.assertEqual(('gene', 'protein'),
+                                 index.get(MARKER_IRI).biomarker_types)
+                self.assertEqual(
+                    (), index.get("http://purl.obolibrary.org/obo/"
+                                  "UBERON_0002113").biomarker_types)
+
+    def test_save_and_load(self):
+        index = TermIndex()
+        index.add_term(MARKER_IRI, "HGNC:424242", "MARKER", "BM",
+                       biomarker_type='protein')
+        index.add_term(MARKER_IRI, "HGNC:424242", "MARKER", "BM",
+                       biomarker_type='gene')
+        path = os.path.join(self.directory.name, "index.json")
+        index.save(path)
+        self.assertEqual(index.terms, TermIndex.load(path).terms)
+
+
+if __name__ == '__main__':
+    unittest.main()
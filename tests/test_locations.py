@@ -0,0 +1,47 @@
+import copy
+import unittest
+
+from rdflib.compare import isomorphic
+
+from asctb2ccf.locations import reduce_cell_locations
+from asctb2ccf.ontology import BSOntology
+from asctb2ccf.synthetic import generate_rows
+
+
+def build(rows, cell_location):
+    o = BSOntology.new("Kidney", "http://purl.org/ccf/data/test.owl",
+                       cell_location=cell_location)
+    return o.apply_rows(rows).graph
+
+
+class ReduceCellLocationsTest(unittest.TestCase):
+    def setUp(self):
+        self.rows = list(generate_rows(40))
+        # The cell type of the first row is also located in the parent of
+        # its structure, which the reduction leaves out
+        row = copy.deepcopy(self.rows[0])
+        row['anatomical_structures'] = row['anatomical_structures'][:-1]
+        self.rows.append(row)
+        self.reduced = build(self.rows, 'reduced')
+
+    def test_leaf(self):
+        graph = build(self.rows, 'leaf')
+        self.assertGreater(reduce_cell_locations(graph), 0)
+        self.assertTrue(isomorphic(self.reduced, graph))
+
+    def test_reduced(self):
+        graph = build(self.rows, 'reduced')
+        self.assertEqual(0, reduce_cell_locations(graph))
+        self.assertTrue(isomorphic(self.reduced, graph))
+
+    def test_shards_of_reduced_locations(self):
+        # The reduced shards keep the locations implied across shards
+        # until the merged graph is reduced
+        graph = build(self.rows[:20], 'reduced')
+        graph += build(self.rows[20:], 'reduced')
+        reduce_cell_locations(graph)
+        self.assertTrue(isomorphic(self.reduced, graph))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from asctb2ccf.merge import merge
+from asctb2ccf.ontology import BSOntology
+from asctb2ccf.registry import ProvisionalIdRegistry
+from asctb2ccf.synthetic import generate_rows
+
+
+class MergeTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def build(self, name, format):
+        o = BSOntology.new("Kidney", "http://purl.org/ccf/data/test.owl",
+                           registry=ProvisionalIdRegistry())
+        for row in generate_rows(30):
+            o = o.mutate_cell_biomarker(row)
+        o.serialize(self.path(name), format)
+        return self.path(name)
+
+    def read(self, name):
+        with open(self.path(name)) as f:
+            return f.read().splitlines()
+
+    def test_rdf_xml_keeps_the_content_addressed_blank_nodes(self):
+        sources = [self.build("kidney.nt", 'nt'),
+                   self.build("kidney.owl", 'xml')]
+        merge(sources[:1], self.path("nt.nt"))
+        merge(sources, self.path("both.nt"))
+        lines = self.read("both.nt")
+        self.assertTrue(any(line.startswith("_:cbs") for line in lines))
+        self.assertEqual(lines, self.read("nt.nt"))
+
+    def test_multi_valued_annotations_are_kept(self):
+        with open(self.path("marker.nt"), 'w') as f:
+            f.write('<http://h/1> <http://purl.org/ccf/ccf_biomarker_type> '
+                    '"protein" .\n'
+                    '<http://h/1> <http://purl.org/ccf/ccf_biomarker_type> '
+                    '"gene" .\n'
+                    '<http://h/1> <http://purl.org/ccf/ccf_pref_label> '
+                    '"b" .\n'
+                    '<http://h/1> <http://purl.org/ccf/ccf_pref_label> '
+                    '"a" .\n')
+        self.assertEqual(merge([self.path("marker.nt")],
+                               self.path("merged.nt")), 3)
+        self.assertNotIn('"b"', "".join(self.read("merged.nt")))
+
+    def test_other_formats_are_rejected(self):
+        with self.assertRaises(ValueError):
+            merge([self.path("kidney.ttl")], self.path("merged.nt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+from argparse import Namespace
+
+from rdflib import Graph
+
+from asctb2ccf import pipeline
+from asctb2ccf.synthetic import generate_rows
+
+
+class PipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_original_arguments(self):
+        # The arguments of the first versions of the command line only
+        output = os.path.join(self.directory.name, "kidney.owl")
+        args = Namespace(organ_name="Kidney", gsheet_url=None,
+                         ontology_iri="http://purl.org/ccf/data/test.owl",
+                         cell_biomarkers_only=False, output=output)
+        pipeline.run(args, rows=list(generate_rows(10)))
+        graph = Graph()
+        graph.parse(output, format='xml')
+        self.assertGreater(len(graph), 0)
+        self.assertFalse(hasattr(args, 'shards'))
+
+    def test_with_defaults(self):
+        args = pipeline.with_defaults(Namespace(organ_name="Kidney",
+                                                shards=2))
+        self.assertEqual("Kidney", args.organ_name)
+        self.assertEqual(2, args.shards)
+        self.assertEqual('all', args.cell_location)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+import unittest
+
+from asctb2ccf import pipeline
+from asctb2ccf.profiling import Profiler
+from asctb2ccf.synthetic import generate_rows
+from tests.utils import make_args
+
+
+class ProfilingTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.rows = list(generate_rows(30))
+
+    def convert(self, name, **kwargs):
+        output = os.path.join(self.directory.name, name)
+        pipeline.run(make_args(output=output, format='nt-sorted', **kwargs),
+                     rows=self.rows)
+        return output
+
+    def test_profile_times_the_conversion_path(self):
+        output = self.convert("profiled.nt", profile=True)
+        with open(f"{output}.profile.json") as f:
+            report = json.load(f)
+        self.assertEqual(['apply_row'], list(report['methods']))
+        self.assertEqual(30, report['methods']['apply_row']['calls'])
+        self.assertEqual(30, report['rows'])
+        self.assertGreater(report['peak_memory'], 0)
+        with open(output, 'rb') as f,\
+                open(self.convert("plain.nt"), 'rb') as g:
+            self.assertEqual(f.read(), g.read())
+
+    def test_cell_biomarkers_only(self):
+        profiler = Profiler()
+        pipeline.run(make_args(output=os.path.join(self.directory.name,
+                                                   "cbs.nt"),
+                               cell_biomarkers_only=True),
+                     profiler=profiler, rows=self.rows)
+        self.assertEqual(['mutate_cell_biomarker'], list(profiler.methods))
+
+    def test_traced_memory(self):
+        profiler = Profiler(trace_memory=True)
+        profiler.start()
+        data = [0] * 100000
+        profiler.stop()
+        self.assertGreaterEqual(profiler.peak_memory, 8 * len(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
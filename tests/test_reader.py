@@ -0,0 +1,78 @@
+import io
+import unittest
+
+from asctb2ccf.reader import read_rows
+
+
+def read(text):
+    return list(read_rows(io.StringIO(text)))
+
+
+HEADER = ("AS/1,AS/1/LABEL,AS/1/ID,AS/2,AS/2/LABEL,AS/2/ID,"
+          "CT/1,CT/1/LABEL,CT/1/ID,"
+          "BGene/1,BGene/1/LABEL,BGene/1/ID,BGene/2,BGene/2/LABEL,BGene/2/ID,"
+          "BProtein/1,BProtein/1/LABEL,BProtein/1/ID,"
+          "BLipid/1,BLipid/1/LABEL,BLipid/1/ID,"
+          "BMetabolites/1,BMetabolites/1/LABEL,BMetabolites/1/ID,"
+          "BProteoform/1,BProteoform/1/LABEL,BProteoform/1/ID,"
+          "REF/1,REF/1/ID,REF/1/NOTES,REF/2,REF/2/DOI,REF/2/ID\n")
+
+
+class ReaderTest(unittest.TestCase):
+    def test_header_detection(self):
+        rows = read("Kidney,,\nAuthors:,someone,\n,,\n"
+                    "AS/1,AS/1/LABEL,AS/1/ID\n"
+                    "kidney,kidney,UBERON:0002113\n")
+        self.assertEqual([{'name': "kidney", 'rdfs_label': "kidney",
+                           'id': "UBERON:0002113"}],
+                         [term for row in rows
+                          for term in row['anatomical_structures']])
+        with self.assertRaises(ValueError):
+            read("Kidney,,\nkidney,kidney,UBERON:0002113\n")
+
+    def test_blank_columns_and_lines_are_skipped(self):
+        rows = read(HEADER
+                    + ",,,nephron,nephron,UBERON:0001285,"
+                    + ",,," + ",,,GENE2,,HGNC:2," + ",,," * 4 + ",,,,,\n"
+                    + "," * HEADER.count(",") + "\n")
+        self.assertEqual(1, len(rows))
+        row = rows[0]
+        # AS/2 is the first structure of the row once AS/1 is skipped
+        self.assertEqual(["UBERON:0001285"],
+                         [term['id'] for term in row['anatomical_structures']])
+        self.assertEqual([], row['cell_types'])
+        self.assertEqual(["HGNC:2"],
+                         [marker['id'] for marker in row['biomarkers_gene']])
+        self.assertEqual([], row['references'])
+
+    def test_biomarker_families(self):
+        rows = read(HEADER
+                    + "kidney,,UBERON:0002113,,,,podocyte,,CL:0000653,"
+                    + "GENE1,,HGNC:1,,,,PROTEIN1,,HGNC:11,LIPID1,,LM:1,"
+                    + "METABOLITE1,,HMDB:1,PROTEOFORM1,,PR:1,,,,,,\n")
+        row = rows[0]
+        for b_type, marker_id in [('gene', "HGNC:1"), ('protein', "HGNC:11"),
+                                  ('lipids', "LM:1"),
+                                  ('metabolites', "HMDB:1"),
+                                  ('proteoforms', "PR:1")]:
+            with self.subTest(b_type=b_type):
+                self.assertEqual(
+                    [(marker_id, b_type)],
+                    [(marker['id'], marker['b_type'])
+                     for marker in row['biomarkers_' + b_type]])
+        self.assertEqual(["HGNC:1", "HGNC:11", "LM:1", "HMDB:1", "PR:1"],
+                         [marker['id'] for marker in row['biomarkers']])
+
+    def test_references(self):
+        rows = read(HEADER
+                    + "kidney,,UBERON:0002113" + ",,," * 8
+                    + ",DOI: 10.1/a,PMID:1,a note,"
+                    + "Smith et al.,doi:10.2/b,PMID:2\n")
+        self.assertEqual([
+            {'id': "PMID:1", 'doi': "DOI: 10.1/a", 'notes': "a note"},
+            {'id': "PMID:2", 'doi': "doi:10.2/b", 'notes': ""}
+        ], rows[0]['references'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import json
+import os
+import tempfile
+import unittest
+
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+from asctb2ccf import pipeline
+from asctb2ccf.synthetic import generate_rows
+from tests.utils import make_args
+
+
+class ShardsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.rows = list(generate_rows(40))
+
+    def convert(self, name, **kwargs):
+        output = os.path.join(self.directory.name, name)
+        pipeline.run(make_args(output=output, format='nt', index=True,
+                               **kwargs), rows=self.rows)
+        graph = Graph()
+        graph.parse(output, format='nt')
+        with open(f"{output}.index.json") as f:
+            return graph, json.load(f)
+
+    def test_same_output_as_serial(self):
+        for kwargs in [{}, {'streaming': True},
+                       {'cell_location': 'reduced', 'closure': True},
+                       {'cell_biomarkers_only': True}]:
+            with self.subTest(**kwargs):
+                serial_graph, serial_index = self.convert("serial.nt",
+                                                          **kwargs)
+                graph, index = self.convert("sharded.nt", shards=3, **kwargs)
+                self.assertTrue(isomorphic(serial_graph, graph))
+                self.assertEqual(serial_index, index)
+
+
+if __name__ == '__main__':
+    unittest.main()
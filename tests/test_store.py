@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import RDFS
+from rdflib.store import NO_STORE
+
+from asctb2ccf import pipeline
+from asctb2ccf.store import SQLiteStore
+from asctb2ccf.synthetic import generate_rows
+from tests.utils import make_args
+
+
+TERM = URIRef("http://purl.obolibrary.org/obo/UBERON_0002113")
+
+
+def count(path, table):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(
+            f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        connection.close()
+
+
+class SQLiteStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "test.store")
+
+    def test_bulk_load_drops_duplicates(self):
+        store = SQLiteStore(self.path)
+        triple = (TERM, RDFS.label, Literal("kidney"))
+        with store.bulk_load():
+            store.addN([triple + (None,), triple + (None,)])
+            self.assertEqual(1, len(store))
+            self.assertEqual([triple], [t for t, _ in store.triples(
+                (None, None, None))])
+        self.assertEqual(1, len(store))
+        indexes = {name for (name,) in store.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'triple'")}
+        self.assertEqual({'triple_spo', 'triple_pos', 'triple_os'}, indexes)
+        # The unique index skips the duplicates again
+        store.add(triple)
+        self.assertEqual(1, len(store))
+        store.close()
+
+    def test_read_only_reopen(self):
+        store = SQLiteStore(self.path)
+        graph = Graph(store)
+        graph.add((TERM, RDFS.label, Literal("kidney")))
+        store.close()
+
+        store = SQLiteStore(self.path, read_only=True)
+        self.assertEqual([Literal("kidney")],
+                         list(Graph(store).objects(TERM, RDFS.label)))
+        with self.assertRaises(sqlite3.OperationalError):
+            store.add((TERM, RDFS.label, Literal("renal")))
+        store.close()
+
+        missing = SQLiteStore(read_only=True)
+        self.assertEqual(NO_STORE, missing.open(
+            os.path.join(self.directory.name, "missing", "test.store")))
+
+    def test_rollback_clears_the_term_cache(self):
+        store = SQLiteStore(self.path)
+        triple = (TERM, RDFS.label, Literal("kidney"))
+        store.add(triple)
+        store.rollback()
+        self.assertEqual(0, len(store))
+        # The IDs of the rolled back terms must not be reused
+        store.add(triple)
+        store.commit()
+        self.assertEqual([triple], [t for t, _ in store.triples(
+            (None, None, None))])
+        store.close()
+
+    def test_clear_removes_the_terms(self):
+        store = SQLiteStore(self.path)
+        store.add((TERM, RDFS.label, Literal("kidney")))
+        store.remove((None, None, None))
+        store.commit()
+        self.assertEqual(0, count(self.path, "term"))
+        store.add((TERM, RDFS.label, Literal("renal")))
+        self.assertEqual([Literal("renal")],
+                         list(Graph(store).objects(TERM, RDFS.label)))
+        store.close()
+
+    def test_rerun_reuses_the_store_file(self):
+        output = os.path.join(self.directory.name, "kidney.nt")
+        args = make_args(output=output, format='nt', store=True)
+        pipeline.run(args, rows=list(generate_rows(20)))
+        terms = count(f"{output}.store", "term")
+        with open(output, 'rb') as f:
+            first_output = f.read()
+        pipeline.run(args, rows=list(generate_rows(20)))
+        self.assertEqual(terms, count(f"{output}.store", "term"))
+        with open(output, 'rb') as f:
+            self.assertEqual(len(first_output), len(f.read()))
+        # A smaller table leaves no term of the previous one behind
+        pipeline.run(args, rows=list(generate_rows(5)))
+        self.assertLess(count(f"{output}.store", "term"), terms)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from rdflib.namespace import DCTERMS
+
+from asctb2ccf.ontology import BSOntology
+from asctb2ccf.synthetic import generate_rows
+from asctb2ccf.validation import validate_row
+
+
+def make_row(doi):
+    row = next(iter(generate_rows(1)))
+    row['references'] = [{'id': "", 'notes': "", 'doi': doi}]
+    return row
+
+
+def convert_references(row):
+    o = BSOntology.new("Kidney", "http://purl.org/ccf/data/test.owl")
+    o = o.mutate_cell_biomarker(row)
+    return [str(value) for value in o.graph.objects(None,
+                                                    DCTERMS.references)]
+
+
+class DoiValidationTest(unittest.TestCase):
+    def _problems(self, doi):
+        return [problem.problem for problem in validate_row(0, make_row(doi))
+                if problem.column == "REF/1/DOI"]
+
+    def test_converted_doi(self):
+        for doi in ["DOI: 10.1038/s41586", "doi:10.1/x", "doi: 10.1/a b"]:
+            with self.subTest(doi=doi):
+                self.assertEqual([], self._problems(doi))
+                self.assertEqual(1, len(convert_references(make_row(doi))))
+
+    def test_ignored_doi(self):
+        for doi in ["Doi: 10.1/x", "https://doi.org/10.1/x"]:
+            with self.subTest(doi=doi):
+                self.assertEqual(
+                    ["Missing doi: or DOI: prefix, the reference is ignored"],
+                    self._problems(doi))
+                self.assertEqual([], convert_references(make_row(doi)))
+
+    def test_malformed_doi(self):
+        self.assertEqual(
+            ["Malformed DOI, the reference is converted as is"],
+            self._problems("doi: pending"))
+        self.assertEqual(["http://doi.org/pending"],
+                         convert_references(make_row("doi: pending")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Helpers shared by the tests"""
+from argparse import Namespace
+
+
+def make_args(**kwargs):
+    """Returns the command line arguments of a conversion, with the
+       defaults of bin/asctb2ccf overridden by the given ones
+    """
+    args = Namespace(
+        organ_name="Kidney",
+        gsheet_url=None,
+        input_csv=None,
+        ontology_iri="http://purl.org/ccf/data/test.owl",
+        cell_biomarkers_only=False,
+        cell_location='all',
+        closure=False,
+        index=False,
+        output=None,
+        format=None,
+        compress=None,
+        validate=False,
+        validation_report=None,
+        validate_only=False,
+        streaming=False,
+        shards=1,
+        store=False,
+        incremental=False,
+        profile=False,
+        id_registry=None,
+        release=None,
+        cache_dir=None,
+        cache_ttl=24 * 60 * 60,
+        offline=False,
+        build_cache=None,
+        build_cache_size=4 * 1024 * 1024 * 1024,
+        manifest=None,
+        jobs=1,
+        fetch_concurrency=8,
+        fetch_per_host=4,
+        fetch_timeout=330,
+        checkpoint=None)
+    for key, value in kwargs.items():
+        setattr(args, key, value)
+    return args